@@ -0,0 +1,64 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+# Benchmark of the loading of pre-parsed packages, JSON versus binary packages, on synthetic packages.
+#
+# For each size, the time to load a package is measured (best of several runs) :
+# * json : decoding the JSON serialization ;
+# * binary : decoding the binary package.
+#
+# Usage : python3 benchmarks/interchange.py [--sizes 10,100,1000] [--repeat 20]
+
+from argparse import ArgumentParser
+
+from electronic_package_descriptor import DeserializerOfPackage, SerializerOfPackage
+
+from electronic_symbol_generator_for_cad.binary import binaryFrom, packageFromBinary
+
+from stages import bestTime
+from synthetic import packageOf
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark of the loading of packages.")
+    parser.add_argument("--sizes", type=str, default="10,100,1000")
+    parser.add_argument("--groups", type=int, default=4, help="groups per package")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measure")
+    args = parser.parse_args()
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        p = packageOf(size, args.groups)
+        serialized = SerializerOfPackage().jsonFrom(p)
+        encoded = binaryFrom(p)
+        assert binaryFrom(packageFromBinary(encoded)) == encoded
+        json = bestTime(
+            lambda: DeserializerOfPackage().packageFromJsonString(serialized),
+            args.repeat,
+        )
+        decoded = bestTime(lambda: packageFromBinary(encoded), args.repeat)
+        print(
+            f"{size:6} pins : json {len(serialized):8} bytes {json * 1000:8.2f} ms, "
+            f"binary {len(encoded):8} bytes {decoded * 1000:8.2f} ms (x{json / decoded:.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
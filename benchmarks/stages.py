@@ -0,0 +1,209 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+# Per-stage benchmark of the generator on synthetic packages.
+#
+# For each pattern of group, each physical layout and each size, a synthetic datasheet is generated, then the time of
+# each stage is measured (best of several runs) :
+# * parse : parsing the markdown datasheet ;
+# * layout : applying the layout managers and computing the geometry of every kicad5 symbol variant, into a cache of
+#   layouts ;
+# * render : rendering the lines of every kicad5 symbol variant from a cache already holding the layouts and the
+#   geometries, i.e. the serialization only ;
+# * write : writing the rendered lines into a file.
+#
+# The results can be saved as a JSON baseline, and compared with a previous baseline.
+#
+# Usage : python3 benchmarks/stages.py [--sizes 10,100,1000,10000] [--save baseline.json] [--compare baseline.json]
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from typing import Callable, Dict, List, Optional
+
+from electronic_package_descriptor import ParserOfMarkdownDatasheet
+
+from electronic_symbol_generator_for_cad.engine import CacheOfLayouts
+from electronic_symbol_generator_for_cad.kicad5 import SymbolGeneratorForKicad5
+from electronic_symbol_generator_for_cad.symbolGenerator import (
+    writeLinesWithSeparator,
+)
+
+from synthetic import datasheetOf, namesOfLayouts, namesOfPatterns
+
+stages = ["parse", "layout", "render", "write"]
+
+
+def bestTime(fn: Callable, repeat: int, setup: Optional[Callable] = None) -> float:
+    """
+    The best time of ``fn()``, or of ``fn(setup())`` when ``setup`` is given, the setup not being timed.
+    """
+    best = None
+    for _ in range(repeat):
+        args = (setup(),) if setup != None else ()
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best == None or elapsed < best else best
+    return best
+
+
+def applyLayouts(p) -> CacheOfLayouts:
+    """
+    A cache holding the layouts and the geometry of every kicad5 symbol variant of the package.
+    """
+    layouts = CacheOfLayouts()
+    for generator in SymbolGeneratorForKicad5(p, layouts=layouts).generators.values():
+        generator.geometry
+    return layouts
+
+
+def copyOfLayouts(layouts: CacheOfLayouts) -> CacheOfLayouts:
+    """
+    A cache holding the same layouts and geometries, so that what a rendering adds is not reused by the next one.
+    """
+    result = CacheOfLayouts(layouts.widths)
+    result.layouts.update(layouts.layouts)
+    result.derived.update(layouts.derived)
+    return result
+
+
+def renderSymbols(p, layouts: CacheOfLayouts) -> Dict[str, List[str]]:
+    return dict(SymbolGeneratorForKicad5(p, layouts=layouts).symbolSet)
+
+
+def writeSymbols(symbols: Dict[str, List[str]], path: str):
+    with open(path, "w", encoding="utf-8") as out:
+        for lines in symbols.values():
+            writeLinesWithSeparator(out, lines)
+
+
+def measureCase(
+    pattern: str, layout: str, pins: int, groups: int, repeat: int, path: str
+) -> Dict:
+    lines = datasheetOf(pins, groups, pattern, layout)
+    p = ParserOfMarkdownDatasheet().parseLines(lines)
+    layouts = applyLayouts(p)
+    symbols = renderSymbols(p, copyOfLayouts(layouts))
+    return {
+        "pattern": pattern,
+        "physical": layout,
+        "pins": pins,
+        "groups": groups,
+        "parse": bestTime(
+            lambda: ParserOfMarkdownDatasheet().parseLines(lines), repeat
+        ),
+        "layout": bestTime(lambda: applyLayouts(p), repeat),
+        "render": bestTime(
+            lambda copy: renderSymbols(p, copy),
+            repeat,
+            setup=lambda: copyOfLayouts(layouts),
+        ),
+        "write": bestTime(lambda: writeSymbols(symbols, path), repeat),
+    }
+
+
+def keyOf(result: Dict) -> tuple:
+    return (result["pattern"], result["physical"], result["pins"], result["groups"])
+
+
+def describeEnvironment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(results: List[Dict], baseline: Dict, threshold: float) -> int:
+    """
+    Prints the ratio current/baseline of each stage, returns the count of regressions (ratio above the threshold).
+    """
+    previous = {keyOf(r): r for r in baseline["results"]}
+    regressions = 0
+    for r in results:
+        p = previous.get(keyOf(r))
+        if p == None:
+            continue
+        ratios = {s: r[s] / p[s] if p[s] > 0 else 1.0 for s in stages}
+        worst = max(ratios.values())
+        if worst > threshold:
+            regressions += 1
+        print(
+            f"{'SLOWER' if worst > threshold else 'ok    '} {r['pattern']:10} {r['physical']} {r['pins']:6} pins : "
+            + ", ".join(f"{s} x{ratios[s]:.2f}" for s in stages)
+        )
+    return regressions
+
+
+def main():
+    parser = ArgumentParser(description="Per-stage benchmark on synthetic packages.")
+    parser.add_argument("--sizes", type=str, default="10,100,1000,10000")
+    parser.add_argument("--groups", type=int, default=16, help="groups per package")
+    parser.add_argument("--patterns", type=str, default=",".join(namesOfPatterns))
+    parser.add_argument("--layouts", type=str, default=",".join(namesOfLayouts))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measure")
+    parser.add_argument("--save", type=str, help="path of the baseline to write")
+    parser.add_argument("--compare", type=str, help="path of a baseline to compare")
+    parser.add_argument(
+        "--threshold", type=float, default=1.25, help="ratio flagging a regression"
+    )
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out.lib")
+        for pins in [int(s) for s in args.sizes.split(",")]:
+            for pattern in args.patterns.split(","):
+                for layout in args.layouts.split(","):
+                    r = measureCase(
+                        pattern, layout, pins, args.groups, args.repeat, path
+                    )
+                    results.append(r)
+                    print(
+                        f"{pattern:10} {layout} {pins:6} pins : "
+                        + ", ".join(f"{s} {r[s] * 1000:9.2f} ms" for s in stages)
+                    )
+
+    if args.save != None:
+        with open(args.save, "w") as f:
+            json.dump(
+                {"environment": describeEnvironment(), "results": results}, f, indent=1
+            )
+    if args.compare != None:
+        with open(args.compare) as f:
+            sys.exit(compare(results, json.load(f), args.threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+# Cold-start benchmark of the command line interface.
+#
+# Each scenario runs ``python -X importtime -m electronic_symbol_generator_for_cad ...`` in a fresh interpreter, and
+# measures the cumulated import time of the top-level imports, and the wall time of the whole invocation. The best of
+# several runs is kept.
+#
+# A scenario fails when its import time exceeds its budget, or when it imports a module that its output format does not
+# need. The exit status is the count of failed scenarios.
+#
+# Usage : python3 benchmarks/startup.py [--runs N] [--scale FACTOR] [--output report.json]
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from typing import Dict, List, Tuple
+
+pathOfSample = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "tests", "data", "pal20r6.md"
+)
+
+kicad5Modules = "electronic_symbol_generator_for_cad.kicad5"
+kicad6Modules = "electronic_symbol_generator_for_cad.kicad6"
+descriptorModules = "electronic_package_descriptor"
+
+# name -> (arguments, budget of import time in ms, modules that MUST NOT be imported)
+scenarios = {
+    "help": (["--help"], 100, [descriptorModules, kicad5Modules, kicad6Modules]),
+    "json": (["--format", "json", pathOfSample], 150, [kicad5Modules, kicad6Modules]),
+    "binary": (
+        ["--format", "binary", pathOfSample],
+        150,
+        [kicad5Modules, kicad6Modules],
+    ),
+    "kicad5": (["--format", "kicad5", pathOfSample], 200, [kicad6Modules]),
+    "kicad6": (["--format", "kicad6", pathOfSample], 200, [kicad5Modules]),
+}
+
+
+def parseImportTime(stderr: str) -> Tuple[float, List[str]]:
+    """
+    Extract the cumulated import time of the top-level imports (in ms) and the list of imported modules from the
+    output of ``-X importtime``.
+    """
+    total = 0
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        modules.append(name.strip())
+        if not name.startswith("  "):  # top level import
+            total += int(cumulative)
+    return total / 1000, modules
+
+
+def measure(arguments: List[str], runs: int) -> Dict:
+    best = None
+    with tempfile.TemporaryDirectory() as into:
+        for _ in range(runs):
+            command = [sys.executable, "-X", "importtime"]
+            command += ["-m", "electronic_symbol_generator_for_cad"] + arguments
+            if arguments != ["--help"]:
+                command += ["--into", into]
+            start = time.perf_counter()
+            completed = subprocess.run(command, capture_output=True, text=True)
+            wall = (time.perf_counter() - start) * 1000
+            if completed.returncode != 0:
+                raise RuntimeError(f"{command} failed :\n{completed.stderr}")
+            importTime, modules = parseImportTime(completed.stderr)
+            if best == None or importTime < best["importTime"]:
+                best = {"importTime": importTime, "wallTime": wall, "modules": modules}
+    return best
+
+
+def main():
+    parser = ArgumentParser(description="Cold-start benchmark of elsygen.")
+    parser.add_argument("--runs", type=int, default=5, help="runs per scenario")
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="factor applied to the budgets"
+    )
+    parser.add_argument("--output", type=str, help="path of the JSON report")
+    args = parser.parse_args()
+
+    report = {}
+    failures = 0
+    for name, (arguments, budget, forbidden) in scenarios.items():
+        result = measure(arguments, args.runs)
+        budget = budget * args.scale
+        unexpected = [
+            m
+            for m in result["modules"]
+            if any(m == f or m.startswith(f + ".") for f in forbidden)
+        ]
+        ok = result["importTime"] <= budget and len(unexpected) == 0
+        failures += 0 if ok else 1
+        report[name] = {
+            "importTime": result["importTime"],
+            "wallTime": result["wallTime"],
+            "budget": budget,
+            "unexpectedModules": unexpected,
+            "ok": ok,
+        }
+        print(
+            f"{'OK  ' if ok else 'FAIL'} {name:8} imports {result['importTime']:7.1f} ms (budget {budget:.0f} ms), wall {result['wallTime']:7.1f} ms"
+            + (f", unexpected : {unexpected}" if len(unexpected) > 0 else "")
+        )
+    if args.output != None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(failures)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+# Generator of synthetic datasheets, to benchmark the generator on packages of any size.
+#
+# A synthetic datasheet has N pins, M groups of pins that are all recognized as the same pattern of group, and uses one
+# of the physical layouts. The pins that do not fit into the groups are left ungrouped, with a mix of every type.
+
+from typing import List, Optional
+
+from electronic_package_descriptor import (
+    LayoutOfPins,
+    PackageDescription,
+    ParserOfMarkdownDatasheet,
+    PatternOfGroup,
+)
+
+# name of each pattern of group, 'MIXED' being the general case (no recognized pattern)
+namesOfPatterns = ["MIXED"] + [p.name for p in PatternOfGroup]
+namesOfLayouts = [l.value for l in LayoutOfPins]
+
+typesOfUngroupedPins = ["PWR", "GND", "DNC", "I", "ICLK", "O", "O3", "OCOL", "B3", "B"]
+typesOfMixedGroups = ["I", "ICLK", "O", "O3", "B", "B3", "PWR", "GND", "OPWR"]
+typesOfBuses = ["I", "O3", "B3"]
+
+
+def pinsOfGroup(pattern: str, g: int, size: int) -> List[tuple]:
+    """
+    Pins ``(name, type)`` of the group of index ``g``, having ``size`` pins when the pattern allows it.
+
+    Names never end with a digit, nor with P/M/+/- (except for pairs), so that no unexpected bus or pair is recognized.
+    """
+    if pattern == "BUS":
+        t = typesOfBuses[g % len(typesOfBuses)]
+        return [(f"B{g}X{i}", t) for i in range(size)]
+    if pattern == "POWER":
+        return [(f"V{g}N{i}X", "PWR" if i % 2 == 0 else "GND") for i in range(size)]
+    if pattern == "AMPOP_IO":
+        return [(f"A{g}IN+", "I"), (f"A{g}IN-", "I"), (f"A{g}OUT", "O")]
+    if pattern == "AMPOP_VREF":
+        return [(f"R{g}V+", "PWR"), (f"R{g}V-", "PWR")]
+    # general case
+    return [
+        (f"G{g}N{i}X", typesOfMixedGroups[i % len(typesOfMixedGroups)])
+        for i in range(size)
+    ]
+
+
+def datasheetOf(
+    pinCount: int, groupCount: int, pattern: str = "MIXED", layout: str = "DIP"
+) -> List[str]:
+    """
+    Lines of a markdown datasheet having ``pinCount`` pins, with ``groupCount`` groups of the given pattern.
+    """
+    groupSize = max(1, pinCount // (2 * groupCount)) if groupCount > 0 else 0
+    pins = []  # (name, type, group)
+    groups = []
+    for g in range(groupCount):
+        groupPins = pinsOfGroup(pattern, g, max(2, groupSize))
+        if len(pins) + len(groupPins) > pinCount:
+            break
+        groups.append(f"G{g}")
+        pins += [(name, t, f"G{g}") for name, t in groupPins]
+    i = 0
+    while len(pins) < pinCount:
+        pins.append((f"U{i}X", typesOfUngroupedPins[i % len(typesOfUngroupedPins)], ""))
+        i += 1
+
+    lines = [
+        f"# Synthetic {pattern} {layout} {pinCount} pins {groupCount} groups",
+        "",
+        "## Symbol",
+        "",
+        f"* Aliases : SYN_{pattern}_{layout}_{pinCount}",
+        "* Reference : U",
+        f"* Pins layout : {layout}",
+        "",
+        "## Pinout",
+        "",
+        "|Pin|Name|Pin Type|Group|Comment|",
+        "|---|---|---|---|---|",
+    ]
+    lines += [f"|{n + 1}|{name}|{t}|{g}||" for n, (name, t, g) in enumerate(pins)]
+    lines += [
+        "",
+        "### Pin groups",
+        "",
+        "|Group id|Rank|Comment|",
+        "|---|---|---|",
+    ]
+    lines += [f"|{g}|{10 * (r + 1)}|Group {g}|" for r, g in enumerate(groups)]
+    lines += [""]
+    return [line + "\n" for line in lines]
+
+
+def packageOf(
+    pinCount: int, groupCount: int, pattern: str = "MIXED", layout: str = "DIP"
+) -> PackageDescription:
+    return ParserOfMarkdownDatasheet().parseLines(
+        datasheetOf(pinCount, groupCount, pattern, layout)
+    )
+
+
+if __name__ == "__main__":
+    # sanity check : every group is recognized with the expected pattern
+    for pattern in namesOfPatterns:
+        for layout in namesOfLayouts:
+            p = packageOf(100, 8, pattern, layout)
+            expected = None if pattern == "MIXED" else PatternOfGroup[pattern]
+            assert all(g.pattern == expected for g in p.groupedPins), pattern
+            assert p.layoutOfPins == LayoutOfPins(layout)
+            pinCount = len(p.ungroupedPins) + sum(len(g.pins) for g in p.groupedPins)
+            assert pinCount == 100, (pattern, layout, pinCount)
+            print(f"{pattern:10} {layout} : {len(p.groupedPins)} groups, OK")
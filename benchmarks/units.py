@@ -0,0 +1,84 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+# Benchmark of the memoization of the units of multi-unit symbols, on synthetic parts having 64 groups.
+#
+# The functionnal multi-unit symbol of each part is rendered :
+# * from scratch : the layout and the pins of each group are computed for the group alone ;
+# * memoized : the groups having the same structure share their layout and the places of their pins.
+#
+# Usage : python3 benchmarks/units.py [--units 64] [--size 8] [--repeat 5]
+
+from argparse import ArgumentParser
+
+from electronic_symbol_generator_for_cad.engine import CacheOfLayouts, signatureOfGroup
+from electronic_symbol_generator_for_cad.kicad5.symbolGenerator_fmu import (
+    SymbolGeneratorForKicad5_Functionnal_MultiUnit,
+)
+
+from stages import bestTime
+from synthetic import packageOf
+
+
+class CacheWithoutTemplates(CacheOfLayouts):
+    """Never reuses the template of the unit of another group."""
+
+    def derivedOf(self, key, compute):
+        if key[0] == "template of unit":
+            return compute()
+        return super().derivedOf(key, compute)
+
+
+def MultiUnitFromScratch(p):
+    return SymbolGeneratorForKicad5_Functionnal_MultiUnit(
+        p, layouts=CacheWithoutTemplates()
+    )
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark of the memoization of units.")
+    parser.add_argument("--units", type=int, default=64, help="groups per part")
+    parser.add_argument("--size", type=int, default=8, help="pins per group")
+    parser.add_argument("--patterns", type=str, default="AMPOP_IO,POWER,BUS,MIXED")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measure")
+    args = parser.parse_args()
+
+    for pattern in args.patterns.split(","):
+        p = packageOf(2 * args.units * args.size, args.units, pattern)
+        memoized = SymbolGeneratorForKicad5_Functionnal_MultiUnit(p)
+        assert MultiUnitFromScratch(p).symbol == memoized.symbol, pattern
+        signatures = {
+            signatureOfGroup(g, memoized.layouts.widths) for g in p.groupedPins
+        }
+        fromScratch = bestTime(lambda: MultiUnitFromScratch(p).symbol, args.repeat)
+        withMemo = bestTime(
+            lambda: SymbolGeneratorForKicad5_Functionnal_MultiUnit(p).symbol,
+            args.repeat,
+        )
+        print(
+            f"{pattern:10} {len(p.groupedPins):3} groups, {len(signatures):3} structures : "
+            f"from scratch {fromScratch * 1000:8.2f} ms, memoized {withMemo * 1000:8.2f} ms, "
+            f"x{fromScratch / withMemo:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+# Benchmark of the table of pin widths, on the four kicad5 variants of a large synthetic package.
+#
+# Each variant is rendered with :
+# * scanned : the width of a pin is computed again each time it is pushed on a rail, as before the table existed ;
+# * per variant : each variant computes the widths of the pins once, in its own table ;
+# * shared : the widths are computed once per package, in the table shared by all the variants.
+#
+# Usage : python3 benchmarks/widths.py [--pins 2000] [--groups 16] [--repeat 5]
+
+from argparse import ArgumentParser
+
+from electronic_package_descriptor import PinDescription
+
+from electronic_symbol_generator_for_cad.engine import CacheOfLayouts, TableOfPinWidths
+from electronic_symbol_generator_for_cad.kicad5 import SymbolGeneratorForKicad5
+
+from stages import bestTime
+from synthetic import packageOf
+
+
+class TableOfScannedWidths(TableOfPinWidths):
+    """Computes the width of a pin at each lookup, without remembering it."""
+
+    def __missing__(self, pin: PinDescription) -> int:
+        if pin is None:
+            return 0
+        return len("".join(c for c in pin.name if c not in "~")) + 1
+
+
+def renderVariants(p, tableOf) -> dict:
+    """
+    Renders each variant with the table given by ``tableOf(variant)``, returns the symbol of each variant.
+    """
+    generators = SymbolGeneratorForKicad5(p).generators
+    result = {}
+    for key, generator in generators.items():
+        generator.layouts = CacheOfLayouts(tableOf(key))
+        result[key] = generator.symbol
+    return result
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark of the table of pin widths.")
+    parser.add_argument("--pins", type=int, default=2000)
+    parser.add_argument("--groups", type=int, default=16, help="groups per package")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measure")
+    args = parser.parse_args()
+
+    p = packageOf(args.pins, args.groups)
+    variants = list(SymbolGeneratorForKicad5(p).generators)
+    shared = TableOfPinWidths()
+    strategies = {
+        "scanned": lambda key: TableOfScannedWidths(),
+        "per variant": lambda key: TableOfPinWidths(),
+        "shared": lambda key: shared,
+    }
+
+    # every strategy must render the same symbols
+    reference = renderVariants(p, strategies["scanned"])
+    for name, tableOf in strategies.items():
+        assert renderVariants(p, tableOf) == reference, name
+
+    times = {}
+    for name, tableOf in strategies.items():
+        if name == "shared":
+            shared.clear()  # then kept between the runs, like between the variants
+        times[name] = bestTime(lambda: renderVariants(p, tableOf), args.repeat)
+    print(f"{args.pins} pins, {len(p.groupedPins)} groups, {len(variants)} variants")
+    for name, elapsed in times.items():
+        print(
+            f"{name:12} : {elapsed * 1000:9.2f} ms, x{times['scanned'] / elapsed:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -19,4 +19,13 @@ If not, see <https://www.gnu.org/licenses/>.
 ---
 """
 
-from .sygen import SymbolGeneratorCli
+__all__ = ["SymbolGeneratorCli"]
+
+
+def __getattr__(name: str):
+    # loaded on first access, so that importing a submodule (e.g. the client) stays cheap
+    if name == "SymbolGeneratorCli":
+        from .sygen import SymbolGeneratorCli
+
+        return SymbolGeneratorCli
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
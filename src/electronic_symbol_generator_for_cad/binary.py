@@ -0,0 +1,208 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import mmap
+import os
+import struct
+from typing import BinaryIO, Dict, List, Optional
+
+from electronic_package_descriptor import (
+    GroupOfPins,
+    LayoutOfPins,
+    PackageDescription,
+    PinDescription,
+)
+
+# first bytes of a binary package, followed by the version of its encoding
+magicOfBinaryPackage = b"ELSYPKG\0"
+
+# bump when the encoding changes ; a package of another version is rejected
+versionOfBinaryPackage = 1
+
+# magic, version, then the count of strings, the size of the table of strings and the count of integers
+headerOfBinaryPackage = struct.Struct("<8sHIII")
+
+# separator of the strings of the table
+separatorOfStrings = "\0"
+
+
+class EncoderOfBinaryPackage:
+    """
+    Collects the integers describing a package, the strings being replaced by their index in a table of strings.
+    """
+
+    def __init__(self):
+        self.integers: List[int] = []
+        self.indexOfString: Dict[str, int] = {}
+
+    def string(self, value: Optional[str]):
+        if value == None:
+            self.integers.append(0)
+            return
+        if separatorOfStrings in value:
+            raise ValueError(f"unencodable string {repr(value)}")
+        index = self.indexOfString.get(value)
+        if index == None:
+            index = len(self.indexOfString) + 1  # 0 is None
+            self.indexOfString[value] = index
+        self.integers.append(index)
+
+    def bytes(self) -> bytes:
+        table = separatorOfStrings.join(self.indexOfString).encode("utf-8")
+        header = headerOfBinaryPackage.pack(
+            magicOfBinaryPackage,
+            versionOfBinaryPackage,
+            len(self.indexOfString),
+            len(table),
+            len(self.integers),
+        )
+        return header + table + struct.pack(f"<{len(self.integers)}i", *self.integers)
+
+
+def binaryFrom(package: PackageDescription) -> bytes:
+    """
+    Encodes a package into a binary package.
+
+    After the header, the table of strings is the UTF-8 encoding of the distinct strings, separated by a null
+    character ; then the package is described by a sequence of little-endian signed 32 bits integers, where a string is
+    its index in the table starting at 1, 0 meaning ``None``. The pins are listed once, the ungrouped pins first, and
+    the groups refer to their pins by index.
+    """
+    pins = list(package.ungroupedPins)
+    indexOfPin = {id(p): i for i, p in enumerate(pins)}
+    for group in package.groupedPins:
+        for p in group.pins:
+            if id(p) not in indexOfPin:
+                indexOfPin[id(p)] = len(pins)
+                pins.append(p)
+
+    encoder = EncoderOfBinaryPackage()
+    encoder.string(package.name)
+    encoder.string(package.prefix)
+    encoder.string(package.datasheet)
+    encoder.string(package.footprintDesignator)
+    encoder.string(package.layoutOfPins.value)
+    encoder.integers.append(len(package.aliases))
+    for alias in package.aliases:
+        encoder.string(alias)
+    encoder.integers.append(len(pins))
+    for p in pins:
+        encoder.string(p.designator.fullname)
+        encoder.string(p.name)
+        encoder.string(p.type.value)
+        encoder.string(p.description)
+    encoder.integers.append(len(package.ungroupedPins))
+    encoder.integers.append(len(package.groupedPins))
+    for group in package.groupedPins:
+        encoder.string(group.designator)
+        encoder.integers.append(group.rank)
+        encoder.string(group.comment)
+        encoder.integers.append(len(group.pins))
+        encoder.integers.extend(indexOfPin[id(p)] for p in group.pins)
+    return encoder.bytes()
+
+
+def packageFromBinary(buffer) -> PackageDescription:
+    """
+    Decodes a binary package from any buffer, e.g. ``bytes`` or a memory-mapped file ; raises ``ValueError`` when the
+    buffer is not a binary package of the supported version.
+
+    Each distinct string is decoded once from the table of strings, and shared by the pins using it.
+    """
+    if len(buffer) < headerOfBinaryPackage.size:
+        raise ValueError("not a binary package")
+    magic, version, countOfStrings, sizeOfTable, countOfIntegers = (
+        headerOfBinaryPackage.unpack_from(buffer, 0)
+    )
+    if magic != magicOfBinaryPackage:
+        raise ValueError("not a binary package")
+    if version != versionOfBinaryPackage:
+        raise ValueError(
+            f"unsupported version {version} of binary package, expected {versionOfBinaryPackage}"
+        )
+    start = headerOfBinaryPackage.size
+    if start + sizeOfTable + 4 * countOfIntegers != len(buffer):
+        raise ValueError("truncated binary package")
+    strings = [None]
+    if countOfStrings > 0:
+        strings += str(buffer[start : start + sizeOfTable], "utf-8").split(
+            separatorOfStrings
+        )
+    if len(strings) != countOfStrings + 1:
+        raise ValueError("corrupted table of strings")
+    integers = iter(
+        struct.unpack_from(f"<{countOfIntegers}i", buffer, start + sizeOfTable)
+    )
+
+    # the sequence of integers is read linearly
+    name = strings[next(integers)]
+    prefix = strings[next(integers)]
+    datasheet = strings[next(integers)]
+    footprintDesignator = strings[next(integers)]
+    layoutOfPins = LayoutOfPins(strings[next(integers)])
+    aliases = [strings[next(integers)] for _ in range(next(integers))]
+    pins = [
+        PinDescription(
+            strings[next(integers)],
+            strings[next(integers)],
+            strings[next(integers)],
+            strings[next(integers)],
+        )
+        for _ in range(next(integers))
+    ]
+    countOfUngroupedPins = next(integers)
+    groups = []
+    for _ in range(next(integers)):
+        designator = strings[next(integers)]
+        rank = next(integers)
+        comment = strings[next(integers)]
+        groups.append(
+            GroupOfPins(
+                designator,
+                rank,
+                comment,
+                [pins[next(integers)] for _ in range(next(integers))],
+            )
+        )
+    return PackageDescription(
+        name,
+        groups,
+        pins[:countOfUngroupedPins],
+        layoutOfPins=layoutOfPins,
+        prefix=prefix,
+        datasheet=datasheet,
+        footprintDesignator=footprintDesignator,
+        aliases=aliases,
+    )
+
+
+def loadBinaryPackage(f: BinaryIO, hash=None) -> PackageDescription:
+    """
+    Decodes the binary package of an open file through a memory mapping, without reading it into memory beforehand.
+
+    When a ``hash`` object (see ``hashlib``) is given, it is updated with the decoded content.
+    """
+    if os.fstat(f.fileno()).st_size == 0:
+        raise ValueError(f"'{f.name}' is not a binary package")
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        if hash != None:
+            hash.update(buffer)
+        return packageFromBinary(buffer)
@@ -0,0 +1,174 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import hashlib
+import os
+import pickle
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+from electronic_package_descriptor import PackageDescription
+
+from .incremental import versionOfDistribution
+
+# bump when the layout of the entries changes
+versionOfCacheEntries = 1
+
+# default count of packages kept in memory by a long running process, see ``CacheOfPackages.keepInMemory``
+defaultCountOfPackagesInMemory = 64
+
+
+def isTrustedDirectory(directory: str) -> bool:
+    """
+    Tells whether the files of the given directory can be unpickled : unpickling a file may run arbitrary code, thus the
+    directory must belong to the current user and must not be writable by the other users. A missing directory is
+    trusted, it will be created as such. Where the ownership of files is not available (e.g. Windows), every directory
+    is trusted.
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    try:
+        stat = os.stat(directory)
+    except FileNotFoundError:
+        return True
+    return stat.st_uid == os.getuid() and stat.st_mode & 0o022 == 0
+
+
+class CacheOfPackages:
+    """
+    On-disk cache of parsed packages, keyed by the content hash of their source.
+
+    Each entry is a compressed pickle of a ``PackageDescription``, stored in its own file. The cache is bounded in size :
+    reading an entry marks it as recently used, and ``evict()`` removes the least recently used entries until the cache
+    fits into its maximal size.
+
+    A long running process, e.g. the generator server, may keep in memory the packages it read or wrote, so that it
+    does not even read the entries again, see ``keepInMemory`` ; a one-shot run does not, as each package is used once.
+
+    As the entries are pickles, the directory of the cache is only used when it is trusted, see ``isTrustedDirectory``.
+    """
+
+    # the pickles of the recently used packages, by key, when kept in memory ; each caller gets its own copy
+    memory: Optional[OrderedDict] = None
+    maxCountInMemory = 0
+
+    # the untrusted directories already reported by the current process
+    untrustedDirectories = set()
+
+    @classmethod
+    def keepInMemory(cls, maxCount: int = defaultCountOfPackagesInMemory):
+        """
+        Keeps in memory, from now on, up to ``maxCount`` packages read or written by the current process.
+        """
+        cls.memory = OrderedDict()
+        cls.maxCountInMemory = maxCount
+
+    def __init__(self, directory: str, maxSize: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.maxSize = maxSize
+        self.salt = f"{versionOfCacheEntries}:{versionOfDistribution('electronic-package-descriptor-by-sporniket', 'electronic_package_descriptor')}:"
+
+    def keyOf(self, kindOfSource: str, content: str) -> str:
+        """
+        Computes the key of a source content ; the kind of source (e.g. ``md`` or ``json``) tells how it is parsed.
+        """
+        h = hashlib.sha256(f"{self.salt}{kindOfSource}:".encode())
+        h.update(content.encode())
+        return h.hexdigest()
+
+    def isTrusted(self) -> bool:
+        if isTrustedDirectory(self.directory):
+            return True
+        if self.directory not in CacheOfPackages.untrustedDirectories:
+            print(
+                f"WARN -- cache directory '{self.directory}' is not owned by the current user, or writable by other users, ignored."
+            )
+            CacheOfPackages.untrustedDirectories.add(self.directory)
+        return False
+
+    def pathOf(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkg")
+
+    def remember(self, key: str, pickled: bytes):
+        memory = CacheOfPackages.memory
+        if memory == None:
+            return
+        memory[key] = pickled
+        memory.move_to_end(key)
+        while len(memory) > CacheOfPackages.maxCountInMemory:
+            memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[PackageDescription]:
+        memory = CacheOfPackages.memory
+        if memory != None and key in memory:
+            memory.move_to_end(key)
+            return pickle.loads(memory[key])
+        if not self.isTrusted():
+            return None
+        path = self.pathOf(key)
+        try:
+            with open(path, "rb") as f:
+                pickled = zlib.decompress(f.read())
+            package = pickle.loads(pickled)
+        except FileNotFoundError:
+            return None
+        except Exception as error:
+            print(f"WARN -- unreadable cache entry '{path}' ({error}), ignored.")
+            return None
+        os.utime(path)  # recently used
+        self.remember(key, pickled)
+        return package
+
+    def put(self, key: str, package: PackageDescription):
+        pickled = pickle.dumps(package, pickle.HIGHEST_PROTOCOL)
+        self.remember(key, pickled)
+        if not self.isTrusted():
+            return
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        path = self.pathOf(key)
+        temporaryPath = f"{path}.{os.getpid()}.tmp"
+        with open(temporaryPath, "wb") as f:
+            f.write(zlib.compress(pickled))
+        os.replace(temporaryPath, path)
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits into its maximal size.
+        """
+        if not os.path.isdir(self.directory) or not self.isTrusted():
+            return
+        entries = []
+        totalSize = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".pkg"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    totalSize += stat.st_size
+        for _, size, path in sorted(entries):
+            if totalSize <= self.maxSize:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            totalSize -= size
@@ -0,0 +1,53 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+from typing import BinaryIO, Callable, Iterator
+
+from electronic_package_descriptor import DeserializerOfPackage, PackageDescription
+
+from .timings import timedStage
+
+
+def packagesOfCatalog(
+    f: BinaryIO, log: Callable[[str], None] = print, hash=None
+) -> Iterator[PackageDescription]:
+    """
+    Yields the packages of an open catalog, i.e. a file having a JSON serialized package on each line (NDJSON).
+
+    The catalog is read line by line, thus only one package is held in memory at a time. Blank lines are ignored, an
+    unreadable package is reported and skipped. When a ``hash`` object (see ``hashlib``) is given, it is updated with
+    each line read.
+    """
+    deserializer = DeserializerOfPackage()
+    for number, line in enumerate(f, start=1):
+        if hash != None:
+            hash.update(line)
+        if len(line.strip()) == 0:
+            continue
+        try:
+            with timedStage("parse"):
+                package = deserializer.packageFromJsonString(line)
+        except (KeyError, SyntaxError, TypeError, ValueError) as error:
+            log(
+                f"WARN -- '{f.name}', line {number} : unreadable package ({error}), skipped."
+            )
+            continue
+        yield package
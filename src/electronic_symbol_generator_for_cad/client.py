@@ -0,0 +1,157 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+from getpass import getuser
+from typing import List, Optional
+
+# only the environment variables read by the generator are forwarded to the server
+prefixOfForwardedVariables = "ELSYGEN_"
+
+
+def defaultDirectoryOfSocket() -> str:
+    """
+    The private directory of the default socket : the ``XDG_RUNTIME_DIR`` environment variable when it is set, or else a
+    per-user directory in the temporary directory, created by the server.
+    """
+    runtimeDirectory = os.environ.get("XDG_RUNTIME_DIR")
+    if runtimeDirectory:
+        return runtimeDirectory
+    return os.path.join(tempfile.gettempdir(), f"elsygen-{getuser()}")
+
+
+def defaultPathOfSocket() -> str:
+    """
+    The path of the socket of the generator server, from the ``ELSYGEN_SOCKET`` environment variable, or else
+    ``elsygen.sock`` in the private directory given by ``defaultDirectoryOfSocket()``.
+    """
+    return os.environ.get(
+        "ELSYGEN_SOCKET",
+        os.path.join(defaultDirectoryOfSocket(), "elsygen.sock"),
+    )
+
+
+def isPrivateDirectory(directory: str) -> bool:
+    """
+    Tells whether the given directory belongs to the current user and is not accessible to the other users (e.g.
+    ``0700``), so that no one else can create or replace a socket inside.
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    try:
+        stat = os.stat(directory)
+    except FileNotFoundError:
+        return False
+    return stat.st_uid == os.getuid() and stat.st_mode & 0o077 == 0
+
+
+def isPrivateSocket(pathOfSocket: str) -> bool:
+    """
+    Tells whether the given socket belongs to the current user, inside a private directory (see
+    ``isPrivateDirectory``) ; otherwise, another user may listen to it, and collect the requests.
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    if not isPrivateDirectory(os.path.dirname(os.path.abspath(pathOfSocket))):
+        return False
+    try:
+        stat = os.stat(pathOfSocket)
+    except FileNotFoundError:
+        return False
+    return stat.st_uid == os.getuid()
+
+
+def forwardedEnvironment() -> dict:
+    """
+    The environment variables sent to the server, i.e. the ones read by the generator.
+    """
+    return {
+        name: value
+        for name, value in os.environ.items()
+        if name.startswith(prefixOfForwardedVariables)
+    }
+
+
+def connectToServer(pathOfSocket: str) -> Optional[socket.socket]:
+    """
+    Returns a socket connected to the generator server, or ``None`` when no server is listening, or when the socket is
+    not private (see ``isPrivateSocket``).
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    if not isPrivateSocket(pathOfSocket):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(pathOfSocket)
+    except (FileNotFoundError, ConnectionRefusedError, PermissionError):
+        client.close()
+        return None
+    return client
+
+
+def forwardToServer(argv: List[str], pathOfSocket: str) -> Optional[int]:
+    """
+    Sends the command line, with the working directory and the environment variables read by the generator, to the
+    generator server, prints its output, and returns its exit status.
+
+    Returns:
+        Optional[int]: the exit status, or ``None`` when no server is listening, when the socket is not private, or when
+            it did not answer.
+    """
+    client = connectToServer(pathOfSocket)
+    if client == None:
+        return None
+    request = {"argv": argv, "cwd": os.getcwd(), "env": forwardedEnvironment()}
+    try:
+        with client, client.makefile("rw", encoding="utf-8") as channel:
+            channel.write(json.dumps(request) + "\n")
+            channel.flush()
+            line = channel.readline()
+    except OSError:  # e.g. the server stopped meanwhile
+        return None
+    if len(line.strip()) == 0:
+        return None
+    response = json.loads(line)
+    sys.stdout.write(response["output"])
+    return response["status"]
+
+
+def main():
+    """
+    Entry point of the thin client : forwards the command line to the generator server when it is running, or else runs
+    the generator in process.
+    """
+    argv = sys.argv[1:]
+    status = forwardToServer(argv, defaultPathOfSocket())
+    if status == None:
+        from .sygen import SymbolGeneratorCli
+
+        status = SymbolGeneratorCli().run(argv)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,13 +21,34 @@ If not, see <https://www.gnu.org/licenses/>.
 
 from .models import *
 from .layout_managers import *
-
+from .geometry import *
 
 __all__ = [
     "RailOfPins",
+    "FrozenRailOfPins",
+    "LayoutOfSymbol",
     "RectangularHolderOfRailsOfPins",
+    "TableOfPinWidths",
     "LayoutManagerForSingleGroup",
     "LayoutManagerForSingleUnit",
     "LayoutManagerForPhysicalSingleUnit",
+    "CacheOfLayouts",
     "typesOfPowerDistributionPins",
+    "pinsInSlotsOf",
+    "signatureOfGroup",
+    "SideOfComponent",
+    "StyleOfText",
+    "PinOfSymbol",
+    "RectangleOfSymbol",
+    "TextOfSymbol",
+    "FieldOfSymbol",
+    "UnitOfSymbol",
+    "GeometryOfSymbol",
+    "lengthOfPins",
+    "placesOfStackOfPins",
+    "toPinsOfStack",
+    "geometryOf",
+    "geometryOfFunctionnalSymbol",
+    "geometryOfMultiUnitSymbol",
+    "geometryOfPhysicalSymbol",
 ]
@@ -0,0 +1,390 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+from enum import Enum
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+from electronic_package_descriptor import (
+    GroupOfPins,
+    PackageDescription,
+    PinDescription,
+)
+
+from .models import LayoutOfSymbol
+from .layout_managers import (
+    CacheOfLayouts,
+    LayoutManagerForPhysicalSingleUnit,
+    LayoutManagerForSingleGroup,
+    LayoutManagerForSingleUnit,
+    pinsInSlotsOf,
+    signatureOfGroup,
+    typesOfPowerDistributionPins,
+)
+
+# The geometry of a symbol is computed once per variant, whatever the output format : rectangles, pins, fields and
+# texts with their absolute coordinates, in mils. Each output format only serializes it.
+
+
+class SideOfComponent(Enum):
+    """
+    The 4 sides of a components will be designated like when looking at a map from above.
+    """
+
+    NORTH = "n"  # ^
+    EAST = "e"  # -->
+    SOUTH = "s"  # v
+    WEST = "w"  # <--
+
+
+class StyleOfText(Enum):
+    NORMAL = "normal"
+    ITALIC = "italic"
+    BOLD = "bold"
+    BOLD_ITALIC = "bold_italic"
+
+
+# the length of every pin
+lengthOfPins = 300
+
+# for each side, the direction from the point where a pin touches the component to the end of the pin
+directionOfPinBySideOfComponent = {
+    "n": (0, 1),
+    "e": (1, 0),
+    "s": (0, -1),
+    "w": (-1, 0),
+}
+
+
+class PinOfSymbol(NamedTuple):
+    """
+    A pin, from its end at ``(x,y)`` towards the given side of the component.
+    """
+
+    pin: PinDescription
+    x: int
+    y: int
+    side: SideOfComponent
+
+
+class RectangleOfSymbol(NamedTuple):
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+    filled: bool
+
+
+class TextOfSymbol(NamedTuple):
+    message: str
+    x: int
+    y: int
+
+
+class FieldOfSymbol(NamedTuple):
+    """
+    A field of the symbol : 0 is the reference, 1 the value, 2 the footprint and 3 the datasheet ; ``text`` is
+    ``None`` when the package does not specify it.
+    """
+
+    index: int
+    text: Optional[str]
+    x: int
+    y: int
+    style: StyleOfText
+    visible: bool
+
+
+class UnitOfSymbol(NamedTuple):
+    """
+    The drawing of a unit ; the unit 0 is common to all the units.
+    """
+
+    unit: int
+    caption: Optional[str]  # describes the unit, for the formats having comments
+    texts: Tuple[TextOfSymbol, ...]
+    rectangles: Tuple[RectangleOfSymbol, ...]
+    pins: Tuple[PinOfSymbol, ...]
+
+
+class GeometryOfSymbol(NamedTuple):
+    fields: Tuple[FieldOfSymbol, ...]
+    units: Tuple[UnitOfSymbol, ...]
+
+    @property
+    def countOfUnits(self) -> int:
+        return max(1, sum(1 for unit in self.units if unit.unit > 0))
+
+
+def placesOfStackOfPins(
+    x: int,
+    y: int,
+    sideOfComponent: SideOfComponent,
+    offset: int,
+    pins: List[PinDescription],
+) -> Iterator[Tuple[PinDescription, int, int]]:
+    """
+    The actual pins of the stack, with the point where each one touches the component.
+    """
+    dx = (
+        offset
+        if sideOfComponent == SideOfComponent.NORTH
+        or sideOfComponent == SideOfComponent.SOUTH
+        else 0
+    )
+    dy = (
+        -offset
+        if sideOfComponent == SideOfComponent.EAST
+        or sideOfComponent == SideOfComponent.WEST
+        else 0
+    )
+    return (
+        (pin, x + dx * i, y + dy * i) for i, pin in enumerate(pins) if pin is not None
+    )
+
+
+def toPinsOfStack(
+    x: int,
+    y: int,
+    sideOfComponent: SideOfComponent,
+    offset: int,
+    pins: List[PinDescription],
+) -> List[PinOfSymbol]:
+    """
+    The actual pins of the stack, the first item touching the component at ``(x,y)``, the next ones every ``offset``.
+    """
+    dx, dy = directionOfPinBySideOfComponent[sideOfComponent.value]
+    places = placesOfStackOfPins(
+        x + dx * lengthOfPins, y + dy * lengthOfPins, sideOfComponent, offset, pins
+    )
+    # same as ``PinOfSymbol(pin, px, py, sideOfComponent)``, without the constructor written in python
+    make = tuple.__new__
+    return [make(PinOfSymbol, (*place, sideOfComponent)) for place in places]
+
+
+def fieldsOf(p: PackageDescription, x: int, y: int) -> Tuple[FieldOfSymbol, ...]:
+    """
+    The fields of a symbol : the value at ``(x,y)``, the reference above, then the hidden footprint and datasheet.
+    """
+    return (
+        FieldOfSymbol(0, p.prefix, x, y + 100, StyleOfText.NORMAL, True),
+        FieldOfSymbol(1, p.name, x, y, StyleOfText.BOLD, True),
+        FieldOfSymbol(2, p.footprintDesignator, x, y + 200, StyleOfText.NORMAL, False),
+        FieldOfSymbol(3, p.datasheet, x, y + 300, StyleOfText.NORMAL, False),
+    )
+
+
+def outlinesOf(
+    x: int, y: int, main: LayoutOfSymbol, spacing: int
+) -> List[RectangleOfSymbol]:
+    """
+    The separators between the groups of pins of the main rectangle, its top-left corner being at ``(x,y)``.
+    """
+    result = []
+    y = y - main.paddingNorth * spacing
+    for x1, x2, outlines in [
+        (x, x + main.width * spacing, main.outlineThrough),
+        (x, x + main.paddingWest * spacing, main.outlineWest),
+        (
+            x + (main.width - main.paddingEast) * spacing,
+            x + main.width * spacing,
+            main.outlineEast,
+        ),
+    ]:
+        for i in range(len(outlines) - 1):
+            y1 = y - outlines[i] * spacing - spacing
+            y2 = y - outlines[i + 1] * spacing - spacing
+            result.append(RectangleOfSymbol(x1, y1, x2, y2, False))
+    return result
+
+
+def geometryOfMainRectangle(
+    p: PackageDescription, main: LayoutOfSymbol, spacing: int
+) -> GeometryOfSymbol:
+    """
+    A single unit symbol, the main rectangle being centered around origin and the fields above its top-right corner.
+    """
+    mainWidth = main.width * spacing
+    mainHeight = main.height * spacing
+    x = -int(mainWidth / 2)
+    y = int(mainHeight / 2)
+    xText = (
+        x
+        if main.north.length == 0
+        else x + spacing * (main.paddingWest + main.north.length + 1)
+    )
+    pins = []
+    for px, py, side, rail in [
+        (x, y - spacing * main.paddingNorth, SideOfComponent.WEST, main.west),
+        (x + spacing * main.paddingWest, y, SideOfComponent.NORTH, main.north),
+        (
+            x + mainWidth,
+            y - spacing * main.paddingNorth,
+            SideOfComponent.EAST,
+            main.east,
+        ),
+        (
+            x + spacing * main.paddingWest,
+            y - mainHeight,
+            SideOfComponent.SOUTH,
+            main.south,
+        ),
+    ]:
+        pins.extend(toPinsOfStack(px, py, side, spacing, [None, *rail.items]))
+    return GeometryOfSymbol(
+        fieldsOf(p, xText, y + 100),
+        (
+            UnitOfSymbol(
+                0,
+                None,
+                (),
+                (
+                    RectangleOfSymbol(x, y, x + mainWidth, y - mainHeight, True),
+                    *outlinesOf(x, y, main, spacing),
+                ),
+                tuple(pins),
+            ),
+        ),
+    )
+
+
+def geometryOfFunctionnalSymbol(
+    p: PackageDescription, layouts: CacheOfLayouts, spacing: int
+) -> GeometryOfSymbol:
+    return geometryOfMainRectangle(
+        p, layouts.layoutOf(LayoutManagerForSingleUnit, p), spacing
+    )
+
+
+def geometryOfPhysicalSymbol(
+    p: PackageDescription, layouts: CacheOfLayouts, spacing: int
+) -> GeometryOfSymbol:
+    return geometryOfMainRectangle(
+        p, layouts.layoutOf(LayoutManagerForPhysicalSingleUnit, p), spacing
+    )
+
+
+class TemplateOfUnit(NamedTuple):
+    """
+    The geometry of the unit of a group, shared by every group having the same signature : each pin is given by its
+    index in the slots of the group.
+    """
+
+    width: int
+    height: int
+    pins: Tuple[Tuple[int, int, int, SideOfComponent], ...]
+
+
+def templateOfUnit(
+    g: GroupOfPins, layouts: CacheOfLayouts, spacing: int
+) -> TemplateOfUnit:
+    main = layouts.layoutOf(LayoutManagerForSingleGroup, g)
+    indexes = {id(pin): i for i, pin in enumerate(pinsInSlotsOf(g))}
+    pins = []
+    for x, y, side, rail in [
+        (0, spacing * main.paddingNorth, SideOfComponent.WEST, main.west),
+        (
+            spacing * main.width,
+            spacing * main.paddingNorth,
+            SideOfComponent.EAST,
+            main.east,
+        ),
+        (
+            spacing * main.paddingWest,
+            -spacing * main.height,
+            SideOfComponent.SOUTH,
+            main.south,
+        ),
+    ]:
+        for pin in toPinsOfStack(x, y, side, spacing, [None, *rail.items]):
+            pins.append((indexes[id(pin.pin)], pin.x, pin.y, pin.side))
+    return TemplateOfUnit(main.width, main.height, tuple(pins))
+
+
+def geometryOfGroup(
+    g: GroupOfPins, unit: int, layouts: CacheOfLayouts, spacing: int
+) -> UnitOfSymbol:
+    """
+    The unit of a group, its top-left corner being at origin, the text describing the group being just above.
+
+    The groups having the same signature (see ``signatureOfGroup``) share their layout and the places of their pins.
+    """
+    template = layouts.derivedOf(
+        ("template of unit", signatureOfGroup(g, layouts.widths), spacing),
+        lambda: templateOfUnit(g, layouts, spacing),
+    )
+    pins = pinsInSlotsOf(g)
+    return UnitOfSymbol(
+        unit,
+        f"{g.designator} -- {g.comment}",
+        (TextOfSymbol(g.comment, 0, 100),),
+        (
+            RectangleOfSymbol(
+                0, 0, spacing * template.width, -spacing * template.height, True
+            ),
+        ),
+        tuple(PinOfSymbol(pins[i], x, y, side) for i, x, y, side in template.pins),
+    )
+
+
+def geometryOfMultiUnitSymbol(
+    p: PackageDescription, layouts: CacheOfLayouts, spacing: int
+) -> GeometryOfSymbol:
+    """
+    A unit for each group, then for the ungrouped pins : the others, and the power distribution.
+
+    Given that each unit will have a variable width, depending on the pins of the unit :
+    * the top-left corner of the main rectangle will be stucked at (0,0)
+    * the text fields and the text describing the unit will be tacked at x = 0 and just above the main rectangle
+      (no pins on the north side of the unit, ever)
+    """
+    groups = list(p.groupedPins)
+    ungroupedOthers = [
+        pin for pin in p.ungroupedPins if pin.type not in typesOfPowerDistributionPins
+    ]
+    if len(ungroupedOthers) > 0:
+        # ungrouped pins : others (no pwr, opwr or gnd)
+        groups.append(GroupOfPins("OTHERS", 9998, "Other pins", ungroupedOthers))
+    ungroupedPower = [
+        pin for pin in p.ungroupedPins if pin.type in typesOfPowerDistributionPins
+    ]
+    if len(ungroupedPower) > 0:
+        # ungrouped pins : power distribution (pwr, opwr and gnd)
+        groups.append(GroupOfPins("POWER", 9999, "Power distribution", ungroupedPower))
+    return GeometryOfSymbol(
+        fieldsOf(p, 0, 200),
+        tuple(
+            geometryOfGroup(g, unit, layouts, spacing)
+            for unit, g in enumerate(groups, start=1)
+        ),
+    )
+
+
+def geometryOf(
+    build: Callable[[PackageDescription, CacheOfLayouts, int], GeometryOfSymbol],
+    p: PackageDescription,
+    layouts: CacheOfLayouts,
+    spacing: int,
+) -> GeometryOfSymbol:
+    """
+    The geometry computed by ``build``, once for every generator of symbols, of any format, sharing the cache of
+    layouts.
+    """
+    return layouts.derivedOf((build, p, spacing), lambda: build(p, layouts, spacing))
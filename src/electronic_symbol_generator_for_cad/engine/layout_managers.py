@@ -19,7 +19,7 @@ If not, see <https://www.gnu.org/licenses/>.
 ---
 """
 
-from typing import List, Dict, Union
+from typing import Callable, List, Dict, Union
 from electronic_package_descriptor import (
     Directionnality,
     GroupOfPins,
@@ -29,7 +29,7 @@ from electronic_package_descriptor import (
     TypeOfPin,
 )
 
-from .models import RectangularHolderOfRailsOfPins
+from .models import LayoutOfSymbol, RectangularHolderOfRailsOfPins, TableOfPinWidths
 
 typesOfPowerDistributionPins = (
     TypeOfPin.POWER,
@@ -43,24 +43,18 @@ class LayoutManager:
     Interface to implement.
 
     Subclass this class, define a constructor with any appliable parameters, then use apply to regenerate a the model of the symbol pins.
+
+    The returned layout is immutable, it can be shared and kept.
     """
 
-    def apply(self) -> RectangularHolderOfRailsOfPins:
-        return RailOfPins()
+    def apply(self) -> LayoutOfSymbol:
+        return RectangularHolderOfRailsOfPins().freeze()
 
 
 class LayoutManagerForSingleUnit(LayoutManager):
-    def __init__(self, p: PackageDescription):
+    def __init__(self, p: PackageDescription, widths: TableOfPinWidths = None):
         self.p = p
-        self.outlineThrough = (
-            []
-        )  # List of separator outline from west to east side : (top, length)
-        self.outlineWest = (
-            []
-        )  # List of separator outline on the west side : (top, length)
-        self.outlineEast = (
-            []
-        )  # List of separator outline on the east side : (top, length)
+        self.widths = widths if widths != None else TableOfPinWidths()
 
     def placeUngroupedPins(self, r: RectangularHolderOfRailsOfPins()):
         # to north
@@ -117,8 +111,8 @@ class LayoutManagerForSingleUnit(LayoutManager):
             int: the length of pins added to both sides.
         """
 
-    def apply(self) -> RectangularHolderOfRailsOfPins:
-        result = RectangularHolderOfRailsOfPins()
+    def apply(self) -> LayoutOfSymbol:
+        result = RectangularHolderOfRailsOfPins(self.widths)
         outlineThrough = []
         outlineWest = []
         outlineEast = []
@@ -279,21 +273,43 @@ class LayoutManagerForSingleUnit(LayoutManager):
         result.west.pushSinglePin(None)
         result.east.pushSinglePin(None)
 
-        # save the outline points
-        self.outlineThrough = outlineThrough
-        self.outlineWest = outlineWest
-        self.outlineEast = outlineEast
+        # ready to render, with the outline points
+        return result.freeze(
+            outlineThrough=outlineThrough,
+            outlineWest=outlineWest,
+            outlineEast=outlineEast,
+        )
 
-        # ready to render
-        return result
+
+def pinsInSlotsOf(g: GroupOfPins) -> List[PinDescription]:
+    return [pin for pins in g.slots.values() for pin in pins]
+
+
+def signatureOfGroup(g: GroupOfPins, widths: TableOfPinWidths) -> tuple:
+    """
+    The structure of a group, i.e. everything its layout depends on : pattern, directionnality, and the type and width
+    of the pins of each slot.
+
+    Groups having the same signature have the same layout, the pins at the same index of ``pinsInSlotsOf`` being at
+    the same place.
+    """
+    return (
+        g.pattern,
+        g.directionnality,
+        tuple(
+            (key, tuple((pin.type, widths[pin]) for pin in pins))
+            for key, pins in g.slots.items()
+        ),
+    )
 
 
 class LayoutManagerForSingleGroup(LayoutManager):
-    def __init__(self, g: GroupOfPins):
+    def __init__(self, g: GroupOfPins, widths: TableOfPinWidths = None):
         self.g = g
+        self.widths = widths if widths != None else TableOfPinWidths()
 
-    def apply(self) -> RectangularHolderOfRailsOfPins:
-        main = RectangularHolderOfRailsOfPins()
+    def apply(self) -> LayoutOfSymbol:
+        main = RectangularHolderOfRailsOfPins(self.widths)
         slots = self.g.slots
         if self.g.pattern == PatternOfGroup.BUS:
             if self.g.directionnality == Directionnality.IN:
@@ -309,8 +325,9 @@ class LayoutManagerForSingleGroup(LayoutManager):
             main.west.pushSinglePin(ins[0])
             main.south.pushSinglePin(ins[1])
         elif self.g.pattern == PatternOfGroup.POWER:
-            main.west.push(slots["in"])
-            main.south.push(slots["out"])
+            # a group of power pins may lack either power inputs or grounds
+            main.west.push(slots.get("in", []))
+            main.south.push(slots.get("out", []))
         else:
             # -- compute building metrics
             expectedLengthWest = 0 if "in" not in slots else len(slots["in"])
@@ -377,12 +394,13 @@ class LayoutManagerForSingleGroup(LayoutManager):
                     else:
                         main.east.pushSinglePin(pin)
         # -- Begin surface
-        return main
+        return main.freeze()
 
 
 class LayoutManagerForPhysicalSingleUnit(LayoutManager):
-    def __init__(self, p: PackageDescription):
+    def __init__(self, p: PackageDescription, widths: TableOfPinWidths = None):
         self.p = p
+        self.widths = widths if widths != None else TableOfPinWidths()
 
     @property
     def pins(self) -> List[PinDescription]:
@@ -393,83 +411,116 @@ class LayoutManagerForPhysicalSingleUnit(LayoutManager):
             allThePins += g.pins
         return sorted(allThePins, key=lambda p: p.designator.rank)
 
-    def apply(self) -> RectangularHolderOfRailsOfPins:
+    def apply(self) -> LayoutOfSymbol:
         layout = self.p.layoutOfPins.value
-        return getattr(self, f"apply_{layout}")()
+        return getattr(self, f"apply_{layout}")().freeze()
 
-    def apply_BRD(self):
+    def applyIndexes(self, indexesBySide) -> RectangularHolderOfRailsOfPins:
+        """
+        Pushes the sorted pins on each side, given ``indexesBySide(indexes)`` returning the indexes of the pins to push
+        on each side, sliced from the range of the indexes of all the pins.
+        """
         sortedPins = self.pins
-        halfLength = int(len(sortedPins) / 2)
+        result = RectangularHolderOfRailsOfPins(self.widths)
+        for side, indexes in indexesBySide(range(len(sortedPins))).items():
+            getattr(result, side).push([sortedPins[i] for i in indexes])
+        return result
 
-        result = RectangularHolderOfRailsOfPins()
-        result.west.push(sortedPins[:halfLength])
-        result.east.push(sortedPins[halfLength:])
+    def apply_BRD(self):
+        def indexesBySide(indexes):
+            count = len(indexes)
+            halfLength = int(count / 2)
+            return {"west": indexes[:halfLength], "east": indexes[halfLength:]}
 
-        return result
+        return self.applyIndexes(indexesBySide)
 
     def apply_DIM(self):
-        sortedPins = self.pins
+        def indexesBySide(indexes):
+            return {"west": indexes[0::2], "east": indexes[1::2]}
 
-        result = RectangularHolderOfRailsOfPins()
-        result.west.push(sortedPins[0::2])
-        result.east.push(sortedPins[1::2])
-
-        return result
+        return self.applyIndexes(indexesBySide)
 
     def apply_DIP(self):
-        sortedPins = self.pins
-        halfLength = int(len(sortedPins) / 2)
+        def indexesBySide(indexes):
+            count = len(indexes)
+            halfLength = int(count / 2)
+            return {"west": indexes[:halfLength], "east": indexes[halfLength:][::-1]}
 
-        result = RectangularHolderOfRailsOfPins()
-        result.west.push(sortedPins[:halfLength])
-        result.east.push(list(reversed(sortedPins[halfLength:])))
-
-        return result
+        return self.applyIndexes(indexesBySide)
 
     def apply_LCC(self):
-        sortedPins = self.pins
-        sideLength = int(len(sortedPins) / 4)
-        deltaLeft = int(sideLength / 2) + 1
+        def indexesBySide(indexes):
+            count = len(indexes)
+            sideLength = int(count / 4)
+            deltaLeft = int(sideLength / 2) + 1
+            return {
+                "west": indexes[deltaLeft : deltaLeft + sideLength],
+                "south": indexes[deltaLeft + sideLength : deltaLeft + 2 * sideLength],
+                "east": indexes[
+                    deltaLeft + 2 * sideLength : deltaLeft + 3 * sideLength
+                ][::-1],
+                "north": (
+                    list(indexes[deltaLeft + 3 * sideLength : count])
+                    + list(indexes[0:deltaLeft])
+                )[::-1],
+            }
+
+        return self.applyIndexes(indexesBySide)
 
-        result = RectangularHolderOfRailsOfPins()
-        result.west.push(sortedPins[deltaLeft : deltaLeft + sideLength])
-        result.south.push(
-            sortedPins[deltaLeft + sideLength : deltaLeft + 2 * sideLength]
-        )
-        result.east.push(
-            list(
-                reversed(
-                    sortedPins[deltaLeft + 2 * sideLength : deltaLeft + 3 * sideLength]
-                )
-            )
-        )
-        result.north.push(
-            list(
-                reversed(
-                    sortedPins[deltaLeft + 3 * sideLength : len(sortedPins)]
-                    + sortedPins[0:deltaLeft]
-                )
-            )
-        )
+    def apply_QFP(self):
+        def indexesBySide(indexes):
+            count = len(indexes)
+            sideLength = int(count / 4)
+            return {
+                "west": indexes[0:sideLength],
+                "south": indexes[sideLength : 2 * sideLength],
+                "east": indexes[2 * sideLength : 3 * sideLength][::-1],
+                "north": indexes[3 * sideLength : count][::-1],
+            }
+
+        return self.applyIndexes(indexesBySide)
 
-        return result
+    def apply_SIM(self):
+        def indexesBySide(indexes):
+            return {"west": indexes}
 
-    def apply_QFP(self):
-        sortedPins = self.pins
-        sideLength = int(len(sortedPins) / 4)
+        return self.applyIndexes(indexesBySide)
 
-        result = RectangularHolderOfRailsOfPins()
-        result.west.push(sortedPins[0:sideLength])
-        result.south.push(sortedPins[sideLength : 2 * sideLength])
-        result.east.push(list(reversed(sortedPins[2 * sideLength : 3 * sideLength])))
-        result.north.push(list(reversed(sortedPins[3 * sideLength : len(sortedPins)])))
 
-        return result
+class CacheOfLayouts:
+    """
+    The layouts of a package, each one computed once and shared by every generator of symbols reading from this cache.
 
-    def apply_SIM(self):
-        sortedPins = self.pins
+    A layout is identified by the layout manager class (the strategy) and the subject given to it, i.e. the package or
+    one of its groups. The table of pin widths is shared by every layout manager.
 
-        result = RectangularHolderOfRailsOfPins()
-        result.west.push(sortedPins)
+    The data derived from a layout by a generator, e.g. pins rendered for several variants, can be shared as well.
+    """
 
-        return result
+    def __init__(self, widths: TableOfPinWidths = None):
+        self.widths = widths if widths != None else TableOfPinWidths()
+        self.layouts: Dict[tuple, LayoutOfSymbol] = {}
+        self.derived: Dict[tuple, object] = {}
+
+    def layoutOf(
+        self, strategy: type, subject: Union[PackageDescription, GroupOfPins]
+    ) -> LayoutOfSymbol:
+        key = (strategy, subject)
+        layout = self.layouts.get(key)
+        if layout == None:
+            layout = strategy(subject, self.widths).apply()
+            self.layouts[key] = layout
+        return layout
+
+    def clear(self):
+        """
+        Forgets every layout, e.g. after a change of the package.
+        """
+        self.widths.clear()
+        self.layouts.clear()
+        self.derived.clear()
+
+    def derivedOf(self, key: tuple, compute: Callable[[], object]) -> object:
+        if key not in self.derived:
+            self.derived[key] = compute()
+        return self.derived[key]
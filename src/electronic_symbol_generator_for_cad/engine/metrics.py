@@ -19,6 +19,7 @@ If not, see <https://www.gnu.org/licenses/>.
 ---
 """
 
+# the geometry of the symbols is computed in mils, whatever the output format
 metrics = {
     "spacing": 100,  # space between 2 pins
     "margin": 200,  # minimal spacing between the border and the first pin, and the spacing between pins of the other side (north-south, and west-east)
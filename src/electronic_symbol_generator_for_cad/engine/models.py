@@ -19,10 +19,29 @@ If not, see <https://www.gnu.org/licenses/>.
 ---
 """
 
-from typing import List, Dict, Union
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Dict, Iterator, List, Tuple, Union
 from electronic_package_descriptor import PinDescription
 
 
+class TableOfPinWidths(dict):
+    """
+    The display width of the pins of a package, i.e. the length of their name without the overline markers ('~'), plus
+    one.
+
+    The width of a pin is computed the first time it is needed, then shared by every rail, layout manager and variant
+    of symbol given the same table.
+    """
+
+    def __missing__(self, pin: Union[PinDescription, None]) -> int:
+        if pin is None:
+            return 0
+        width = len(pin.name) - pin.name.count("~") + 1
+        self[pin] = width
+        return width
+
+
 class RailOfPins:
     """
     Collection of pins to put on one side of a component symbol.
@@ -30,31 +49,81 @@ class RailOfPins:
     The pins may be separated by an arbitrary numbers of 'None' items to create spacing.
 
     A rail has a length and a width. The length count the number of pins, the width count the max length of a pin name.
+
+    Only the actual pins are stored, densely ; the 'None' items are counted instead : ``before`` the first pin, ``after``
+    the last pin, and in ``gaps`` for the pins preceded by some of them. Thus padding, centering and trimming take a
+    constant time, and ``items`` is only materialized when needed.
     """
 
-    def __init__(self):
-        self.items = []
+    __slots__ = (
+        "pins",
+        "gaps",
+        "before",
+        "after",
+        "lengthOfBody",
+        "width",
+        "widths",
+        "cache",
+    )
+
+    def __init__(self, widths: TableOfPinWidths = None):
+        self.pins: List[PinDescription] = []
+        # index of pin -> count of 'None' items just before it
+        self.gaps: Dict[int, int] = {}
+        self.before = 0
+        self.after = 0
+        self.lengthOfBody = 0  # from the first pin to the last pin
         self.width = 0
+        self.widths = widths if widths != None else TableOfPinWidths()
+        self.cache = None
 
     @property
     def length(self) -> int:
-        return len(self.items)
+        return self.before + self.lengthOfBody + self.after
+
+    @property
+    def items(self) -> List[Union[PinDescription, None]]:
+        if self.cache == None:
+            self.cache = list(self.iterItems())
+        return self.cache
+
+    def iterItems(self) -> Iterator[Union[PinDescription, None]]:
+        yield from repeat(None, self.before)
+        gaps = self.gaps
+        for i, pin in enumerate(self.pins):
+            if i in gaps:
+                yield from repeat(None, gaps[i])
+            yield pin
+        yield from repeat(None, self.after)
 
     def updateWidth(self, pins: List[PinDescription]):
-        self.width = max(
-            [self.width]
-            + [
-                0 if p is None else len("".join(c for c in p.name if c not in "~")) + 1
-                for p in pins
-            ]
-        )
+        widths = self.widths
+        for p in pins:
+            if p is not None and widths[p] > self.width:
+                self.width = widths[p]
 
     def push(self, pins: List[PinDescription], *, withSeparator=False):
         if len(pins) > 0:
             if withSeparator and self.length > 0:
-                self.items.append(None)
-            self.items.extend(pins)
-            self.updateWidth(pins)
+                self.after += 1
+            for p in pins:
+                if p is None:
+                    self.after += 1
+                    continue
+                if self.widths[p] > self.width:
+                    self.width = self.widths[p]
+                if len(self.pins) == 0:
+                    self.before += self.after
+                    self.after = 0
+                    self.pins.append(p)
+                    self.lengthOfBody = 1
+                else:
+                    if self.after > 0:
+                        self.gaps[len(self.pins)] = self.after
+                    self.lengthOfBody += self.after + 1
+                    self.after = 0
+                    self.pins.append(p)
+            self.cache = None
 
     def pushSinglePin(self, pin: PinDescription):
         self.push([pin])
@@ -62,40 +131,33 @@ class RailOfPins:
     def fillToLength(self, lengthToReach: int):
         delta = lengthToReach - self.length
         if delta > 0:
-            self.items += [None for p in range(delta)]
+            self.after += delta
+            self.cache = None
 
     def fillToLengthBefore(self, lengthToReach: int):
         delta = lengthToReach - self.length
         if delta > 0:
-            self.items = [None for p in range(delta)] + self.items
+            self.before += delta
+            self.cache = None
 
     def fillToLengthCentered(self, lengthToReach: int):
         delta = lengthToReach - self.length
         if delta > 0:
             countBefore = 0 if delta < 2 else int(delta / 2)
-            self.items = (
-                [None for p in range(countBefore)]
-                + self.items
-                + [None for p in range(delta - countBefore)]
-            )
+            self.before += countBefore
+            self.after += delta - countBefore
+            self.cache = None
 
     def trim(self):
         """
         Removes any ``None`` elements before the first actual pin and after the last actual pin.
         """
-        indexOfFirst = 0
-        for p in self.items:
-            if p != None:
-                break
-            indexOfFirst += 1
+        self.before = 0
+        self.after = 0
+        self.cache = None
 
-        indexOfLast = self.length
-        for p in reversed(self.items):
-            if p != None:
-                break
-            indexOfLast -= 1
-
-        self.items = self.items[indexOfFirst:indexOfLast]
+    def freeze(self) -> "FrozenRailOfPins":
+        return FrozenRailOfPins(tuple(self.iterItems()), self.length, self.width)
 
     def equalize(self, rail: "RailOfPins"):
         """
@@ -110,16 +172,52 @@ class RailOfPins:
             rail.fillToLength(self.length)
 
 
+@dataclass(frozen=True)
+class FrozenRailOfPins:
+    """
+    Final state of a rail of pins, see ``RailOfPins``.
+    """
+
+    items: Tuple[Union[PinDescription, None], ...]
+    length: int
+    width: int
+
+
+@dataclass(frozen=True)
+class LayoutOfSymbol:
+    """
+    Result of a layout manager : the rails of pins on each side of the main rectangle, with its geometry computed once.
+
+    The outlines are the positions, along the west and east sides, of separators between groups of pins ; the
+    ``outlineThrough`` separators go from the west side to the east side.
+    """
+
+    north: FrozenRailOfPins
+    east: FrozenRailOfPins
+    south: FrozenRailOfPins
+    west: FrozenRailOfPins
+    paddingNorth: int
+    paddingEast: int
+    paddingSouth: int
+    paddingWest: int
+    width: int
+    height: int
+    outlineThrough: Tuple[int, ...] = ()
+    outlineWest: Tuple[int, ...] = ()
+    outlineEast: Tuple[int, ...] = ()
+
+
 class RectangularHolderOfRailsOfPins:
     """
     Model of an electronic graphic symbol consisting of a rectangle that can have pins on each side.
     """
 
-    def __init__(self):
-        self.north = RailOfPins()
-        self.east = RailOfPins()
-        self.south = RailOfPins()
-        self.west = RailOfPins()
+    def __init__(self, widths: TableOfPinWidths = None):
+        widths = widths if widths != None else TableOfPinWidths()
+        self.north = RailOfPins(widths)
+        self.east = RailOfPins(widths)
+        self.south = RailOfPins(widths)
+        self.west = RailOfPins(widths)
 
     @property
     def paddingNorth(self) -> int:
@@ -186,3 +284,29 @@ class RectangularHolderOfRailsOfPins:
             + self.paddingSouth
             + 1  # to add a space before rendering the first pin
         )
+
+    def freeze(
+        self,
+        *,
+        outlineThrough: List[int] = (),
+        outlineWest: List[int] = (),
+        outlineEast: List[int] = (),
+    ) -> LayoutOfSymbol:
+        """
+        Computes the final layout, the holder must not be modified anymore.
+        """
+        return LayoutOfSymbol(
+            north=self.north.freeze(),
+            east=self.east.freeze(),
+            south=self.south.freeze(),
+            west=self.west.freeze(),
+            paddingNorth=self.paddingNorth,
+            paddingEast=self.paddingEast,
+            paddingSouth=self.paddingSouth,
+            paddingWest=self.paddingWest,
+            width=self.width,
+            height=self.height,
+            outlineThrough=tuple(outlineThrough),
+            outlineWest=tuple(outlineWest),
+            outlineEast=tuple(outlineEast),
+        )
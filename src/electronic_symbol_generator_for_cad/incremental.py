@@ -0,0 +1,243 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, NamedTuple, Optional
+
+# name of the manifest file kept in each directory receiving generated files
+nameOfManifest = ".elsygen-manifest.json"
+
+
+def hashOfSourcesOf(nameOfModule: str) -> str:
+    """
+    The content hash of the python files of the given package, walked in a reproducible order.
+    """
+    from importlib import import_module
+
+    directory = os.path.dirname(import_module(nameOfModule).__file__)
+    h = hashlib.sha256()
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(root, name)
+                h.update(f"{os.path.relpath(path, directory)}\0".encode())
+                with open(path, "rb") as f:
+                    h.update(hashlib.file_digest(f, "sha256").digest())
+    return h.hexdigest()
+
+
+def versionOfDistribution(name: str, nameOfModule: Optional[str] = None) -> str:
+    """
+    The version of the given distribution ; when it is not installed, e.g. a source checkout run with ``PYTHONPATH``,
+    the content hash of the python files of its package ``nameOfModule`` stands for it, so that a change of the code is
+    still noticed.
+    """
+    # importlib.metadata is slow to import, and seldom needed
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        if nameOfModule == None:
+            return "unknown"
+        return f"sources-{hashOfSourcesOf(nameOfModule)}"
+
+
+def currentVersionOfGenerator() -> str:
+    """
+    The version of the code producing the targets, i.e. this package and the package descriptor library that parses
+    the sources.
+    """
+    return "+".join(
+        versionOfDistribution(name, nameOfModule)
+        for name, nameOfModule in [
+            (
+                "electronic-symbol-generator-for-cad-by-sporniket",
+                "electronic_symbol_generator_for_cad",
+            ),
+            (
+                "electronic-package-descriptor-by-sporniket",
+                "electronic_package_descriptor",
+            ),
+        ]
+    )
+
+
+def hashOfFile(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class FingerprintOfSource(NamedTuple):
+    """
+    The content hash of a source, as it has been converted, with its size and modification time when it was opened.
+    """
+
+    hash: str
+    size: int
+    mtime: int
+
+
+def fingerprintOf(stat: os.stat_result, hash) -> FingerprintOfSource:
+    """
+    The fingerprint of a source from its status, taken before reading it, and the ``hashlib`` sha256 object updated
+    with its content.
+    """
+    return FingerprintOfSource(hash.hexdigest(), stat.st_size, stat.st_mtime_ns)
+
+
+def fingerprintOfFile(path: str) -> FingerprintOfSource:
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        return fingerprintOf(stat, hashlib.file_digest(f, "sha256"))
+
+
+class ManifestOfBuild:
+    """
+    Record of the targets generated into a directory : for each target, the source it has been generated from, the
+    content hash of that source, the output format and the version of the generator.
+
+    The size and modification time of the source are recorded too, so that an untouched source does not need to be
+    hashed again.
+    """
+
+    def __init__(self, directory: str, versionOfGenerator: str):
+        self.path = os.path.join(directory, nameOfManifest)
+        self.versionOfGenerator = versionOfGenerator
+        self.entries = {}
+        self.modified = False
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    self.entries = json.load(f)
+            except ValueError:
+                print(f"WARN -- unreadable manifest '{self.path}', ignored.")
+
+    def isUpToDate(self, source: str, target: str, outputFormat: str) -> bool:
+        """
+        Tells whether the target has been generated from the current content of the source, with the same output
+        format and generator version.
+        """
+        entry = self.entries.get(os.path.basename(target))
+        if (
+            entry == None
+            or entry["source"] != os.path.abspath(source)
+            or entry["format"] != outputFormat
+            or entry["version"] != self.versionOfGenerator
+            or not os.path.exists(target)
+        ):
+            return False
+        stat = os.stat(source)
+        if entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            return True
+        if entry["hash"] != hashOfFile(source):
+            return False
+        # same content, only touched
+        entry["size"] = stat.st_size
+        entry["mtime"] = stat.st_mtime_ns
+        self.modified = True
+        return True
+
+    def record(
+        self,
+        source: str,
+        target: str,
+        outputFormat: str,
+        fingerprint: Optional[FingerprintOfSource] = None,
+    ):
+        """
+        Records that the target has been generated from the source ; the fingerprint of the source should be the one of
+        the content actually converted, the current content of the source is fingerprinted otherwise.
+        """
+        if fingerprint == None:
+            fingerprint = fingerprintOfFile(source)
+        self.entries[os.path.basename(target)] = {
+            "source": os.path.abspath(source),
+            "hash": fingerprint.hash,
+            "size": fingerprint.size,
+            "mtime": fingerprint.mtime,
+            "format": outputFormat,
+            "version": self.versionOfGenerator,
+        }
+        self.modified = True
+
+    def save(self):
+        if not self.modified:
+            return
+        temporaryPath = f"{self.path}.tmp"
+        with open(temporaryPath, "w") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(temporaryPath, self.path)
+        self.modified = False
+
+
+class RegistryOfManifests:
+    """
+    The manifests of all the directories receiving generated files, loaded on demand.
+    """
+
+    def __init__(self, versionOfGenerator: Optional[str] = None):
+        self.versionOfGenerator = (
+            versionOfGenerator
+            if versionOfGenerator != None
+            else currentVersionOfGenerator()
+        )
+        self.manifests: Dict[str, ManifestOfBuild] = {}
+        # the source of each target recorded by this run
+        self.sourceByTarget: Dict[str, str] = {}
+
+    def manifestOf(self, target: str) -> ManifestOfBuild:
+        directory = os.path.dirname(os.path.abspath(target))
+        if directory not in self.manifests:
+            self.manifests[directory] = ManifestOfBuild(
+                directory, self.versionOfGenerator
+            )
+        return self.manifests[directory]
+
+    def isUpToDate(self, source: str, target: str, outputFormat: str) -> bool:
+        return self.manifestOf(target).isUpToDate(source, target, outputFormat)
+
+    def record(
+        self,
+        source: str,
+        target: str,
+        outputFormat: str,
+        fingerprint: Optional[FingerprintOfSource] = None,
+    ):
+        """
+        Records that the target has been generated from the source, see ``ManifestOfBuild.record`` ; warns when the
+        target has already been generated from another source by this run, as the latter overwrites the former.
+        """
+        source, target = os.path.abspath(source), os.path.abspath(target)
+        previous = self.sourceByTarget.setdefault(target, source)
+        if previous != source:
+            print(
+                f"WARN -- '{target}' is generated from both '{previous}' and '{source}', the last one wins."
+            )
+            self.sourceByTarget[target] = source
+        self.manifestOf(target).record(source, target, outputFormat, fingerprint)
+
+    def save(self):
+        for manifest in self.manifests.values():
+            manifest.save()
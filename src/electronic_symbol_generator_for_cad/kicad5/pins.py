@@ -19,22 +19,13 @@ If not, see <https://www.gnu.org/licenses/>.
 ---
 """
 
-from typing import List
-from enum import Enum
+from itertools import groupby
+from operator import itemgetter
+from typing import List, Tuple
 
-from electronic_package_descriptor import PinDescription, TypeOfPin
-
-
-class SideOfComponent(Enum):
-    """
-    The 4 sides of a components will be designated like when looking at a map from above.
-    """
-
-    NORTH = "n"  # ^
-    EAST = "e"  # -->
-    SOUTH = "s"  # v
-    WEST = "w"  # <--
+from electronic_package_descriptor import TypeOfPin
 
+from ..engine import PinOfSymbol, lengthOfPins
 
 # pin type to kicad electrical type
 elecTypeByValueOfTypeOfPin = {
@@ -73,108 +64,49 @@ shapeTypeByValueOfTypeOfPin = {
 }
 
 
-def toPinTowardsWest(
-    name: str, index: int, x: int, y: int, elecType: str, shapeType: str, unit: int = 0
-) -> List[str]:
-    """
-    Generate a pin that will touch the component at ``(x,y)``, and will point toward the left of the sheet.
-
-    The pin has a width of 300 mils
-    """
-    return [
-        f"X {name} {index} {x - 300} {y} 300 R 50 50 {unit} 0 {elecType} {shapeType}"
-    ]
-
-
-def toPinTowardsEast(
-    name: str, index: int, x: int, y: int, elecType: str, shapeType: str, unit: int = 0
-) -> List[str]:
-    """
-    Generate a pin that will touch the component at ``(x,y)``, and will point toward the right of the sheet.
-
-    The pin has a width of 300 mils
-    """
-    return [
-        f"X {name} {index} {x + 300} {y} 300 L 50 50 {unit} 0 {elecType} {shapeType}"
-    ]
-
-
-def toPinTowardsNorth(
-    name: str, index: int, x: int, y: int, elecType: str, shapeType: str, unit: int = 0
-) -> List[str]:
-    """
-    Generate a pin that will touch the component at ``(x,y)``, and will point toward the top of the sheet.
+# the columns of a pin line that only depend on the type of the pin : electrical type and shape
+typeColumnsByValueOfTypeOfPin = {
+    t: f"{elecTypeByValueOfTypeOfPin[t]} {shapeTypeByValueOfTypeOfPin[t]}"
+    for t in elecTypeByValueOfTypeOfPin
+}
 
-    The pin has a width of 300 mils
-    """
-    return [
-        f"X {name} {index} {x} {y + 300} 300 D 50 50 {unit} 0 {elecType} {shapeType}"
-    ]
+# for each side, the columns of a pin line between the coordinates of its end and its unit : its length, its
+# orientation (the pin points from its end towards the body) and the size of its name and number.
+middleOfPinBySideOfComponent = {
+    "n": f" {lengthOfPins} D 50 50 ",
+    "e": f" {lengthOfPins} L 50 50 ",
+    "s": f" {lengthOfPins} U 50 50 ",
+    "w": f" {lengthOfPins} R 50 50 ",
+}
 
 
-def toPinTowardsSouth(
-    name: str, index: int, x: int, y: int, elecType: str, shapeType: str, unit: int = 0
-) -> List[str]:
+def toRecordsOfPins(pins: List[PinOfSymbol], unit: int = 0) -> List[Tuple[str, str]]:
     """
-    Generate a pin that will touch the component at ``(x,y)``, and will point toward the bottom of the sheet.
+    Each pin as a record of its line without the type columns, and the value of its type.
 
-    The pin has a width of 300 mils
+    Thus the same pins can be emitted with their actual types, or as passive pins, see ``toLinesOfRecords``.
     """
-    return [
-        f"X {name} {index} {x} {y - 300} 300 U 50 50 {unit} 0 {elecType} {shapeType}"
-    ]
-
-
-toPinBySideOfComponent = {
-    "n": toPinTowardsNorth,
-    "e": toPinTowardsEast,
-    "s": toPinTowardsSouth,
-    "w": toPinTowardsWest,
-}
-
-
-def toStackOfPins(
-    x: int,
-    y: int,
-    sideOfComponent: SideOfComponent,
-    offset: int,
-    pins: List[PinDescription],
-    unit: int = 0,
-    *,
-    forcePassive: bool = False,
-) -> List[str]:
-    locx = x
-    locy = y
-    dx = (
-        offset
-        if sideOfComponent == SideOfComponent.NORTH
-        or sideOfComponent == SideOfComponent.SOUTH
-        else 0
-    )
-    dy = (
-        -offset
-        if sideOfComponent == SideOfComponent.EAST
-        or sideOfComponent == SideOfComponent.WEST
-        else 0
-    )
-    toPin = toPinBySideOfComponent[sideOfComponent.value]
     result = []
-    for pin in pins:
-        if pin != None:
-            typeOfPin = (
-                TypeOfPin.OUTPUT_PASSIVE.value if forcePassive else pin.type.value
-            )
-            result.extend(
-                toPin(
-                    pin.name,
-                    pin.designator.fullname,
-                    locx,
-                    locy,
-                    elecTypeByValueOfTypeOfPin[typeOfPin],
-                    shapeTypeByValueOfTypeOfPin[typeOfPin],
-                    unit,
+    # the pins of a stack are on the same side
+    for side, stack in groupby(pins, itemgetter(3)):
+        middle = middleOfPinBySideOfComponent[side.value]
+        result.extend(
+            [
+                (
+                    f"X {pin.name} {pin.designator.fullname} {x} {y}{middle}{unit} 0 ",
+                    pin.type.value,
                 )
-            )
-        locx += dx
-        locy += dy
+                for pin, x, y, _ in stack
+            ]
+        )
     return result
+
+
+def toLinesOfRecords(
+    records: List[Tuple[str, str]], *, forcePassive: bool = False
+) -> List[str]:
+    if forcePassive:
+        columns = typeColumnsByValueOfTypeOfPin[TypeOfPin.OUTPUT_PASSIVE.value]
+        return [line + columns for line, typeOfPin in records]
+    columns = typeColumnsByValueOfTypeOfPin
+    return [line + columns[typeOfPin] for line, typeOfPin in records]
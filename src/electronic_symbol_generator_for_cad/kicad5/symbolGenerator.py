@@ -19,15 +19,18 @@ If not, see <https://www.gnu.org/licenses/>.
 ---
 """
 
-from typing import List, Dict
+from typing import Iterable
 
 from electronic_package_descriptor import PackageDescription
 from ..symbolGenerator import (
     SymbolGenerator,
-    SingleSymbolGenerator,
+    SetOfSymbols,
     writeLinesWithSeparator,
 )
 
+from ..engine import CacheOfLayouts
+from ..timings import timedVariant
+
 from .symbols import toBeginSymbolSet, toEndSymbolSet
 from .symbolGenerator_fsu import SymbolGeneratorForKicad5_Functionnal
 from .symbolGenerator_fmu import SymbolGeneratorForKicad5_Functionnal_MultiUnit
@@ -36,29 +39,68 @@ from .symbolGenerator_psu import (
     SymbolGeneratorForKicad5_Physical_SingleUnit_Socket,
 )
 
+generatorClassByVariant = {
+    "functionnal_single_unit": SymbolGeneratorForKicad5_Functionnal,
+    "functionnal_multi_unit": SymbolGeneratorForKicad5_Functionnal_MultiUnit,
+    "physical_single_unit": SymbolGeneratorForKicad5_Physical_SingleUnit,
+    "physical_single_unit_socket": SymbolGeneratorForKicad5_Physical_SingleUnit_Socket,
+}
+
 
 class SymbolGeneratorForKicad5(SymbolGenerator):
-    def __init__(self, p: PackageDescription):
+    def __init__(
+        self,
+        p: PackageDescription,
+        variants: Iterable[str] = None,
+        layouts: CacheOfLayouts = None,
+    ):
+        """
+        Args:
+            p (PackageDescription): the package.
+            variants (Iterable[str], optional): the variants of symbols to generate, among the keys of
+                ``generatorClassByVariant`` ; all of them when not specified. The symbols are always generated in the
+                order of ``generatorClassByVariant``.
+            layouts (CacheOfLayouts, optional): the layouts and geometries of the package, to share them with the
+                generators of other formats ; a cache of its own when not specified.
+        """
         self.p = p
+        if variants != None:
+            variants = set(variants)
+            unknown = variants - set(generatorClassByVariant)
+            if len(unknown) > 0:
+                raise ValueError(f"Unknown variants of symbol : {sorted(unknown)}")
+        # each layout, and the width of each pin, is computed once for all the variants
+        self.layouts = layouts if layouts != None else CacheOfLayouts()
+        # the generators of the other variants are not even created
         self.generators = {
-            "functionnal_single_unit": SymbolGeneratorForKicad5_Functionnal(p),
-            "functionnal_multi_unit": SymbolGeneratorForKicad5_Functionnal_MultiUnit(p),
-            "physical_single_unit": SymbolGeneratorForKicad5_Physical_SingleUnit(p),
-            "physical_single_unit_socket": SymbolGeneratorForKicad5_Physical_SingleUnit_Socket(
-                p
-            ),
+            key: generatorClass(p, layouts=self.layouts)
+            for key, generatorClass in generatorClassByVariant.items()
+            if variants == None or key in variants
         }
 
     @property
-    def symbolSet(self) -> Dict[str, List[str]]:
-        return {key: self.generators[key].symbol for key in self.generators}
+    def symbolSet(self) -> SetOfSymbols:
+        return SetOfSymbols(self.generators)
+
+    def invalidate(self):
+        for generator in self.generators.values():
+            generator.invalidate()
 
     def emitSymbolSet(self, out):
-        # emit prolog
-        writeLinesWithSeparator(out, toBeginSymbolSet(self.p.name))
-        # body
-        sset = self.symbolSet
-        for k in sset:
-            writeLinesWithSeparator(out, sset[k])
-        # emit epilog
+        self.emitBeginOfSymbolSet(out, self.p.name)
+        self.emitSymbols(out)
+        self.emitEndOfSymbolSet(out)
+
+    @classmethod
+    def emitBeginOfSymbolSet(cls, out, name: str):
+        writeLinesWithSeparator(out, toBeginSymbolSet(name))
+
+    def emitSymbols(self, out):
+        # one symbol at a time
+        for key, generator in self.generators.items():
+            with timedVariant(key):
+                generator.emitSymbol(out)
+
+    @classmethod
+    def emitEndOfSymbolSet(cls, out):
         writeLinesWithSeparator(out, toEndSymbolSet())
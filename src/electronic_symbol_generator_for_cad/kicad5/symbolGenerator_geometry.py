@@ -0,0 +1,99 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+from typing import List, Tuple
+
+from ..symbolGenerator import SingleSymbolGeneratorOfGeometry
+from ..engine import RectangleOfSymbol, TextOfSymbol, UnitOfSymbol
+
+from .comments import toSubtitle, toTitle
+from .pins import toLinesOfRecords, toRecordsOfPins
+from .symbols import (
+    StyleOfField,
+    toAliases,
+    toBeginDraw,
+    toBeginSymbol,
+    toContour,
+    toEndDraw,
+    toEndSymbol,
+    toFieldInvisible,
+    toFieldVisible,
+    toSurface,
+    toText,
+)
+
+
+class SymbolGeneratorForKicad5_FromGeometry(SingleSymbolGeneratorOfGeometry):
+    """
+    Serializes the geometry of a variant of symbol into the kicad5 format.
+    """
+
+    toLinesOfRecords = staticmethod(toLinesOfRecords)
+
+    def toText(self, text: TextOfSymbol, unit: int) -> List[str]:
+        return toText(text.message, text.x, text.y, unit)
+
+    def toRectangle(self, rectangle: RectangleOfSymbol, unit: int) -> List[str]:
+        r = rectangle
+        return (toSurface if r.filled else toContour)(r.x1, r.y1, r.x2, r.y2, unit)
+
+    def toRecordsOfPins(self, unit: UnitOfSymbol) -> List[Tuple[str, str]]:
+        return toRecordsOfPins(unit.pins, unit.unit)
+
+    def renderUnit(self, unit: UnitOfSymbol, result: List[str]):
+        if unit.caption != None:
+            result.extend(toSubtitle(unit.caption))
+        super().renderUnit(unit, result)
+
+    def renderSymbol(self) -> List[str]:
+        result = []
+        # --- prepare ---
+        suffix = self.suffix
+        geometry = self.geometry
+
+        # --- generate statements ---
+        # prolog
+        result.extend(toTitle(self.title))
+        # main text
+        result.extend(toBeginSymbol(self.name, geometry.countOfUnits))
+        if len(self.p.aliases) > 0:
+            result.extend(toAliases([a + suffix for a in self.p.aliases]))
+        for field in geometry.fields:
+            if field.text == None:
+                continue
+            toField = toFieldVisible if field.visible else toFieldInvisible
+            result.extend(
+                toField(
+                    field.index,
+                    field.text,
+                    field.x,
+                    field.y,
+                    StyleOfField[field.style.name],
+                )
+            )
+        result.extend(toBeginDraw())
+        for unit in geometry.units:
+            self.renderUnit(unit, result)
+
+        # epilog
+        result.extend(toEndDraw())
+        result.extend(toEndSymbol())
+        return result
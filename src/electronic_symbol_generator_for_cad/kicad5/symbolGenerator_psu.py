@@ -19,33 +19,12 @@ If not, see <https://www.gnu.org/licenses/>.
 ---
 """
 
-from typing import List, Dict
-
-from electronic_package_descriptor import PackageDescription
-from ..symbolGenerator import (
-    SymbolGenerator,
-    SingleSymbolGenerator,
-    writeLinesWithSeparator,
-)
-from ..engine import RectangularHolderOfRailsOfPins, LayoutManagerForPhysicalSingleUnit
-
-from .comments import toTitle
-from .pins import PinDescription, SideOfComponent, toStackOfPins
-from .symbols import (
-    StyleOfField,
-    toAliases,
-    toBeginDraw,
-    toBeginSymbol,
-    toEndDraw,
-    toEndSymbol,
-    toFieldInvisible,
-    toFieldVisible,
-    toSurface,
-)
-from .metrics import metrics
-
-
-class SymbolGeneratorForKicad5_Physical(SingleSymbolGenerator):
+from ..engine import geometryOfPhysicalSymbol
+
+from .symbolGenerator_geometry import SymbolGeneratorForKicad5_FromGeometry
+
+
+class SymbolGeneratorForKicad5_Physical(SymbolGeneratorForKicad5_FromGeometry):
     """
     Symbol generator for physical layout, single-unit symbols.
 
@@ -53,121 +32,10 @@ class SymbolGeneratorForKicad5_Physical(SingleSymbolGenerator):
     top-right corner.
     """
 
-    def __init__(self, p: PackageDescription, m: Dict[str, int] = metrics):
-        self.p = p
-        self.metrics = m
-
-    def renderStackOfPins(
-        self,
-        x: int,
-        y: int,
-        sideOfComponent: SideOfComponent,
-        offset: int,
-        pins: List[PinDescription],
-    ) -> List[str]:
-        return []
-
-    def render(
-        self,
-        main: RectangularHolderOfRailsOfPins,
-        x: int,
-        y: int,
-        spacing: int,
-        result: List[str],
-    ):
-        # -- prepare
-        mainWidth = main.width * spacing
-        mainHeight = main.height * spacing
-
-        # prolog
-        # pins
-        # -- prepare rails
-        result.extend(toSurface(x, y, x + mainWidth, y - mainHeight))
-        result.extend(
-            self.renderStackOfPins(
-                x,
-                y - spacing * main.paddingNorth,
-                SideOfComponent.WEST,
-                spacing,
-                [None] + main.west.items,
-            )
-        )
-        result.extend(
-            self.renderStackOfPins(
-                x + spacing * main.paddingWest,
-                y,
-                SideOfComponent.NORTH,
-                spacing,
-                [None] + main.north.items,
-            )
-        )
-        result.extend(
-            self.renderStackOfPins(
-                x + mainWidth,
-                y - spacing * main.paddingNorth,
-                SideOfComponent.EAST,
-                spacing,
-                [None] + main.east.items,
-            )
-        )
-        result.extend(
-            self.renderStackOfPins(
-                x + spacing * main.paddingWest,
-                y - mainHeight,
-                SideOfComponent.SOUTH,
-                spacing,
-                [None] + main.south.items,
-            )
-        )
-        # epilog
+    build = geometryOfPhysicalSymbol
 
-    @property
-    def symbol(self) -> List[str]:
-        result = []
-        # --- prepare ---
-        suffix = self.suffix
-        main = LayoutManagerForPhysicalSingleUnit(self.p).apply()
-
-        spacing = metrics["spacing"]
-        mainWidth = main.width * spacing
-        mainHeight = main.height * spacing
-        xLeft = -int(mainWidth / 2)
-        yTop = int(mainHeight / 2)
-        xRight = xLeft + mainWidth - 1
-        yBottom = yTop - mainHeight + 1
-        xText = (
-            xLeft
-            if main.north.length == 0
-            else xLeft + spacing * (main.paddingWest + main.north.length + 1)
-        )
-
-        # --- generate statements ---
-        # prolog
-        result.extend(toTitle(self.title))
-        # main text
-        result.extend(toBeginSymbol((self.p.name + suffix).upper()))
-        if len(self.p.aliases) > 0:
-            result.extend(toAliases([a + suffix for a in self.p.aliases]))
-        result += toFieldVisible(
-            0, self.p.prefix, xText, yTop + 200, StyleOfField.NORMAL
-        )
-        result += toFieldVisible(1, self.p.name, xText, yTop + 100, StyleOfField.BOLD)
-        if self.p.footprintDesignator != None:
-            result += toFieldInvisible(
-                2, self.p.footprintDesignator, xText, yTop + 300, StyleOfField.NORMAL
-            )
-        if self.p.datasheet != None:
-            result += toFieldInvisible(
-                3, self.p.datasheet, xText, yTop + 400, StyleOfField.NORMAL
-            )
-        result.extend(toBeginDraw())
-
-        self.render(main, xLeft, yTop, spacing, result)
-
-        # epilog
-        result.extend(toEndDraw())
-        result.extend(toEndSymbol())
-        return result
+    # the physical variants only differ by the type of their pins
+    shareRecordsOfPins = True
 
 
 class SymbolGeneratorForKicad5_Physical_SingleUnit(SymbolGeneratorForKicad5_Physical):
@@ -186,16 +54,6 @@ class SymbolGeneratorForKicad5_Physical_SingleUnit(SymbolGeneratorForKicad5_Phys
     def title(self) -> str:
         return f"{self.p.name} -- Physical, single unit symbol"
 
-    def renderStackOfPins(
-        self,
-        x: int,
-        y: int,
-        sideOfComponent: SideOfComponent,
-        offset: int,
-        pins: List[PinDescription],
-    ) -> List[str]:
-        return toStackOfPins(x, y, sideOfComponent, offset, pins)
-
 
 class SymbolGeneratorForKicad5_Physical_SingleUnit_Socket(
     SymbolGeneratorForKicad5_Physical
@@ -207,6 +65,8 @@ class SymbolGeneratorForKicad5_Physical_SingleUnit_Socket(
     top-right corner.
     """
 
+    forcePassive = True
+
     @property
     def suffix(self) -> str:
         return "_socket"
@@ -214,13 +74,3 @@ class SymbolGeneratorForKicad5_Physical_SingleUnit_Socket(
     @property
     def title(self) -> str:
         return f"{self.p.name} -- Physical socket, single unit symbol"
-
-    def renderStackOfPins(
-        self,
-        x: int,
-        y: int,
-        sideOfComponent: SideOfComponent,
-        offset: int,
-        pins: List[PinDescription],
-    ) -> List[str]:
-        return toStackOfPins(x, y, sideOfComponent, offset, pins, forcePassive=True)
@@ -0,0 +1,134 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+from itertools import groupby
+from operator import itemgetter
+from typing import List, Tuple
+
+from electronic_package_descriptor import TypeOfPin
+
+from ..engine import PinOfSymbol, lengthOfPins
+from .symbols import quoted, toMillimeters
+
+# pin type to kicad electrical type
+elecTypeByValueOfTypeOfPin = {
+    "PWR": "power_in",
+    "GND": "power_in",
+    "DNC": "no_connect",
+    "I": "input",
+    "ICLK": "input",
+    "O": "output",
+    "OCLK": "output",
+    "O3": "tri_state",
+    "OCOL": "open_collector",
+    "OEMT": "open_emitter",
+    "OPSV": "passive",
+    "OPWR": "power_out",
+    "B3": "tri_state",
+    "B": "bidirectional",
+}
+
+# pin type to kicad pin shape
+shapeTypeByValueOfTypeOfPin = {
+    "PWR": "line",
+    "GND": "line",
+    "DNC": "line",
+    "I": "line",
+    "ICLK": "clock",
+    "O": "line",
+    "OCLK": "clock",
+    "O3": "line",
+    "OCOL": "line",
+    "OEMT": "line",
+    "OPSV": "line",
+    "OPWR": "line",
+    "B3": "line",
+    "B": "line",
+}
+
+# the tokens of a pin that only depend on the type of the pin : electrical type and shape
+typeColumnsByValueOfTypeOfPin = {
+    t: f"{elecTypeByValueOfTypeOfPin[t]} {shapeTypeByValueOfTypeOfPin[t]}"
+    for t in elecTypeByValueOfTypeOfPin
+}
+
+# for each side, the angle of the pin, pointing from its end towards the component
+angleOfPinBySideOfComponent = {
+    "n": 270,
+    "e": 180,
+    "s": 90,
+    "w": 0,
+}
+
+# the effects of the name and the number of a pin
+effectsOfPin = "(effects (font (size 1.27 1.27)))"
+
+lengthOfPinsInMillimeters = toMillimeters(lengthOfPins)
+
+
+def toOverlined(name: str) -> str:
+    """
+    Converts the overline markers of a name, e.g. ``~OE~`` -> ``~{OE}`` : each '~' toggles the overline in Kicad 5,
+    whereas Kicad 6 encloses the overlined text.
+    """
+    if "~" not in name:
+        return name
+    parts = name.split("~")
+    return "".join(
+        part if i % 2 == 0 else f"~{{{part}}}"
+        for i, part in enumerate(parts)
+        if i % 2 == 1 or len(part) > 0
+    )
+
+
+def toRecordsOfPins(pins: List[PinOfSymbol]) -> List[Tuple[str, str]]:
+    """
+    Each pin as a record of its S-expression after the type tokens, and the value of its type.
+
+    Thus the same pins can be emitted with their actual types, or as passive pins, see ``toLinesOfRecords``.
+    """
+    length = lengthOfPinsInMillimeters
+    result = []
+    # the pins of a stack are on the same side
+    for side, stack in groupby(pins, itemgetter(3)):
+        angle = angleOfPinBySideOfComponent[side.value]
+        result.extend(
+            [
+                (
+                    f" (at {toMillimeters(x)} {toMillimeters(y)} {angle}) (length {length})"
+                    f" (name {quoted(toOverlined(pin.name))} {effectsOfPin})"
+                    f" (number {quoted(pin.designator.fullname)} {effectsOfPin}))",
+                    pin.type.value,
+                )
+                for pin, x, y, _ in stack
+            ]
+        )
+    return result
+
+
+def toLinesOfRecords(
+    records: List[Tuple[str, str]], *, forcePassive: bool = False
+) -> List[str]:
+    if forcePassive:
+        columns = typeColumnsByValueOfTypeOfPin[TypeOfPin.OUTPUT_PASSIVE.value]
+        return [f"      (pin {columns}{line}" for line, typeOfPin in records]
+    columns = typeColumnsByValueOfTypeOfPin
+    return [f"      (pin {columns[typeOfPin]}{line}" for line, typeOfPin in records]
@@ -0,0 +1,105 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+from typing import Iterable
+
+from electronic_package_descriptor import PackageDescription
+from ..symbolGenerator import (
+    SymbolGenerator,
+    SetOfSymbols,
+    writeLinesWithSeparator,
+)
+
+from ..engine import CacheOfLayouts
+from ..timings import timedVariant
+
+from .symbols import toBeginSymbolSet, toEndSymbolSet
+from .symbolGenerator_fsu import SymbolGeneratorForKicad6_Functionnal
+from .symbolGenerator_fmu import SymbolGeneratorForKicad6_Functionnal_MultiUnit
+from .symbolGenerator_psu import (
+    SymbolGeneratorForKicad6_Physical_SingleUnit,
+    SymbolGeneratorForKicad6_Physical_SingleUnit_Socket,
+)
+
+generatorClassByVariant = {
+    "functionnal_single_unit": SymbolGeneratorForKicad6_Functionnal,
+    "functionnal_multi_unit": SymbolGeneratorForKicad6_Functionnal_MultiUnit,
+    "physical_single_unit": SymbolGeneratorForKicad6_Physical_SingleUnit,
+    "physical_single_unit_socket": SymbolGeneratorForKicad6_Physical_SingleUnit_Socket,
+}
+
+
+class SymbolGeneratorForKicad6(SymbolGenerator):
+    def __init__(
+        self,
+        p: PackageDescription,
+        variants: Iterable[str] = None,
+        layouts: CacheOfLayouts = None,
+    ):
+        """
+        Args:
+            p (PackageDescription): the package.
+            variants (Iterable[str], optional): the variants of symbols to generate, among the keys of
+                ``generatorClassByVariant`` ; all of them when not specified. The symbols are always generated in the
+                order of ``generatorClassByVariant``.
+            layouts (CacheOfLayouts, optional): the layouts and geometries of the package, to share them with the
+                generators of other formats ; a cache of its own when not specified.
+        """
+        self.p = p
+        if variants != None:
+            variants = set(variants)
+            unknown = variants - set(generatorClassByVariant)
+            if len(unknown) > 0:
+                raise ValueError(f"Unknown variants of symbol : {sorted(unknown)}")
+        # each layout, and the width of each pin, is computed once for all the variants
+        self.layouts = layouts if layouts != None else CacheOfLayouts()
+        self.generators = {
+            key: generatorClass(p, layouts=self.layouts)
+            for key, generatorClass in generatorClassByVariant.items()
+            if variants == None or key in variants
+        }
+
+    @property
+    def symbolSet(self) -> SetOfSymbols:
+        return SetOfSymbols(self.generators)
+
+    def invalidate(self):
+        for generator in self.generators.values():
+            generator.invalidate()
+
+    def emitSymbolSet(self, out):
+        self.emitBeginOfSymbolSet(out, self.p.name)
+        self.emitSymbols(out)
+        self.emitEndOfSymbolSet(out)
+
+    @classmethod
+    def emitBeginOfSymbolSet(cls, out, name: str):
+        writeLinesWithSeparator(out, toBeginSymbolSet())
+
+    def emitSymbols(self, out):
+        # one symbol at a time : the library is never held in memory as a whole
+        for key, generator in self.generators.items():
+            with timedVariant(key):
+                generator.emitSymbol(out)
+
+    @classmethod
+    def emitEndOfSymbolSet(cls, out):
+        writeLinesWithSeparator(out, toEndSymbolSet())
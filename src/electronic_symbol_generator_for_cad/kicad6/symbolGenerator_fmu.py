@@ -0,0 +1,43 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+from ..engine import geometryOfMultiUnitSymbol
+
+from .symbolGenerator_geometry import SymbolGeneratorForKicad6_FromGeometry
+
+
+class SymbolGeneratorForKicad6_Functionnal_MultiUnit(
+    SymbolGeneratorForKicad6_FromGeometry
+):
+    """
+    Symbol generator for functionnal, multi-unit symbols.
+
+    Given that each unit will have a variable width, depending on the pins of the unit :
+    * the top-left corner of the main rectangle will be stucked at (0,0)
+    * the text fields and the text describing the unit will be tacked at x = 0 and just above the main rectangle
+      (no pins on the north side of the unit, ever)
+    """
+
+    build = geometryOfMultiUnitSymbol
+
+    @property
+    def suffix(self) -> str:
+        return "_mu"
@@ -0,0 +1,79 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+from typing import List, Tuple
+
+from ..symbolGenerator import SingleSymbolGeneratorOfGeometry
+from ..engine import RectangleOfSymbol, TextOfSymbol, UnitOfSymbol
+
+from .pins import toLinesOfRecords, toRecordsOfPins
+from .symbols import (
+    toAliases,
+    toBeginSymbol,
+    toBeginUnit,
+    toContour,
+    toEndSymbol,
+    toEndUnit,
+    toProperties,
+    toSurface,
+    toText,
+)
+
+
+class SymbolGeneratorForKicad6_FromGeometry(SingleSymbolGeneratorOfGeometry):
+    """
+    Serializes the geometry of a variant of symbol into the kicad6 format.
+    """
+
+    toLinesOfRecords = staticmethod(toLinesOfRecords)
+
+    def toText(self, text: TextOfSymbol, unit: int) -> List[str]:
+        return toText(text.message, text.x, text.y)
+
+    def toRectangle(self, rectangle: RectangleOfSymbol, unit: int) -> List[str]:
+        r = rectangle
+        return (toSurface if r.filled else toContour)(r.x1, r.y1, r.x2, r.y2)
+
+    def toRecordsOfPins(self, unit: UnitOfSymbol) -> List[Tuple[str, str]]:
+        return toRecordsOfPins(unit.pins)
+
+    def renderUnit(self, unit: UnitOfSymbol, result: List[str]):
+        result.extend(toBeginUnit(self.name, unit.unit))
+        super().renderUnit(unit, result)
+        result.extend(toEndUnit())
+
+    def renderSymbol(self) -> List[str]:
+        result = []
+        # --- prepare ---
+        name = self.name
+        geometry = self.geometry
+
+        # --- generate statements ---
+        # prolog
+        result.extend(toBeginSymbol(name))
+        result.extend(toProperties(geometry.fields))
+        for unit in geometry.units:
+            self.renderUnit(unit, result)
+
+        # epilog
+        result.extend(toEndSymbol())
+        result.extend(toAliases(self.p, name, self.suffix, geometry.fields))
+        return result
@@ -0,0 +1,62 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+from ..engine import geometryOfPhysicalSymbol
+
+from .symbolGenerator_geometry import SymbolGeneratorForKicad6_FromGeometry
+
+
+class SymbolGeneratorForKicad6_Physical(SymbolGeneratorForKicad6_FromGeometry):
+    """
+    Symbol generator for physical layout, single-unit symbols.
+
+    The symbol main rectangle will be centered around origin. The text will be rendered above the
+    top-right corner.
+    """
+
+    build = geometryOfPhysicalSymbol
+
+    # the physical variants only differ by the type of their pins
+    shareRecordsOfPins = True
+
+
+class SymbolGeneratorForKicad6_Physical_SingleUnit(SymbolGeneratorForKicad6_Physical):
+    """
+    Symbol generator for physical layout, single-unit symbols.
+    """
+
+    @property
+    def suffix(self) -> str:
+        return "_phy"
+
+
+class SymbolGeneratorForKicad6_Physical_SingleUnit_Socket(
+    SymbolGeneratorForKicad6_Physical
+):
+    """
+    Symbol generator for physical layout, single-unit symbols of sockets : every pin is passive.
+    """
+
+    forcePassive = True
+
+    @property
+    def suffix(self) -> str:
+        return "_socket"
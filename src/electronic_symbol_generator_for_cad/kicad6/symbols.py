@@ -0,0 +1,163 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+from typing import Iterable, List
+from enum import Enum
+
+from electronic_package_descriptor import PackageDescription
+
+from ..engine import FieldOfSymbol
+
+# The S-expressions are written as text lines, indented like the files saved by Kicad : no tree of expressions is
+# ever built, each symbol is streamed as soon as its lines are rendered.
+
+
+class StyleOfField(Enum):
+    NORMAL = ""
+    ITALIC = " italic"
+    BOLD = " bold"
+    BOLD_ITALIC = " italic bold"
+
+
+def toMillimeters(mils: int) -> str:
+    """
+    Converts a coordinate in mils into the millimeters expected by Kicad 6, e.g. ``300`` -> ``"7.62"``.
+    """
+    return f"{mils * 0.0254:.4f}".rstrip("0").rstrip(".")
+
+
+def quoted(text: str) -> str:
+    """
+    Makes a string token out of the given text.
+    """
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def toBeginSymbolSet() -> List[str]:
+    return ["(kicad_symbol_lib (version 20211014) (generator elsygen)"]
+
+
+def toEndSymbolSet() -> List[str]:
+    return [")"]
+
+
+def toBeginSymbol(name: str) -> List[str]:
+    return [
+        f"  (symbol {quoted(name)} (pin_names (offset 0)) (in_bom yes) (on_board yes)"
+    ]
+
+
+def toBeginDerivedSymbol(name: str, parent: str) -> List[str]:
+    """
+    Start a symbol that is an alias of the given symbol.
+    """
+    return [f"  (symbol {quoted(name)} (extends {quoted(parent)})"]
+
+
+def toEndSymbol() -> List[str]:
+    return ["  )"]
+
+
+def toBeginUnit(name: str, unit: int = 0) -> List[str]:
+    """
+    Start the drawing of the given unit of a symbol, the unit 0 being common to all the units.
+    """
+    return [f"    (symbol {quoted(f'{name}_{unit}_1')}"]
+
+
+def toEndUnit() -> List[str]:
+    return ["    )"]
+
+
+def toProperty(
+    index: int,
+    key: str,
+    value: str,
+    x: int,
+    y: int,
+    style: StyleOfField,
+    visible: bool = True,
+) -> List[str]:
+    return [
+        f"    (property {quoted(key)} {quoted(value)} (id {index}) (at {toMillimeters(x)} {toMillimeters(y)} 0)"
+        f" (effects (font (size 1.27 1.27){style.value}) (justify left top){'' if visible else ' hide'}))"
+    ]
+
+
+# the key of each field of a symbol, by index
+keyOfPropertyByIndex = ["Reference", "Value", "Footprint", "Datasheet"]
+
+
+def toProperties(fields: Iterable[FieldOfSymbol], value: str = None) -> List[str]:
+    """
+    The mandatory properties of a symbol, from its fields ; the text of the value may be replaced, e.g. for an alias.
+    """
+    result = []
+    for field in fields:
+        text = value if field.index == 1 and value != None else field.text
+        result.extend(
+            toProperty(
+                field.index,
+                keyOfPropertyByIndex[field.index],
+                text if text != None else "",
+                field.x,
+                field.y,
+                StyleOfField[field.style.name],
+                field.visible,
+            )
+        )
+    return result
+
+
+def toAliases(
+    p: PackageDescription, name: str, suffix: str, fields: Iterable[FieldOfSymbol]
+) -> List[str]:
+    """
+    The aliases of the given symbol, as derived symbols to write after it.
+    """
+    result = []
+    for alias in p.aliases:
+        result.extend(toBeginDerivedSymbol((alias + suffix).upper(), name))
+        result.extend(toProperties(fields, alias))
+        result.extend(toEndSymbol())
+    return result
+
+
+def toRectangle(x1: int, y1: int, x2: int, y2: int, fill: str) -> List[str]:
+    return [
+        f"      (rectangle (start {toMillimeters(x1)} {toMillimeters(y1)}) (end {toMillimeters(x2)} {toMillimeters(y2)})"
+        f" (stroke (width 0.254) (type default) (color 0 0 0 0)) (fill (type {fill})))"
+    ]
+
+
+def toContour(x1: int, y1: int, x2: int, y2: int) -> List[str]:
+    return toRectangle(x1, y1, x2, y2, "none")
+
+
+def toSurface(x1: int, y1: int, x2: int, y2: int) -> List[str]:
+    return toRectangle(x1, y1, x2, y2, "background")
+
+
+def toText(message: str, x: int, y: int) -> List[str]:
+    return [
+        f"      (text {quoted(message)} (at {toMillimeters(x)} {toMillimeters(y)} 0)"
+        " (effects (font (size 1.27 1.27)) (justify left top)))"
+    ]
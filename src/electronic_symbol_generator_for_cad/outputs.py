@@ -0,0 +1,152 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import filecmp
+import os
+import tempfile
+from typing import IO, Callable
+
+from .timings import timedStage
+
+
+def currentUmask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# size of the content buffered in memory before being written into a file
+sizeOfChunks = 1024 * 1024
+
+
+class BufferOfTarget:
+    """
+    Collects the content written into a file, and writes it by chunks : the time spent writing into the file is
+    accounted to the ``write`` stage, instead of the stage producing the content (e.g. ``render``), and the memory stays
+    bounded by the size of a chunk.
+    """
+
+    def __init__(self, file: IO):
+        self.file = file
+        self.chunks = []
+        self.size = 0
+
+    def write(self, data) -> int:
+        self.chunks.append(data)
+        self.size += len(data)
+        if self.size >= sizeOfChunks:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if len(self.chunks) > 0:
+            with timedStage("write"):
+                self.file.write(self.chunks[0][:0].join(self.chunks))
+            self.chunks = []
+            self.size = 0
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            with timedStage("write"):
+                self.file.close()
+
+
+class WriterOfTarget:
+    """
+    Generates a target file atomically, and only when its content changes.
+
+    The content is written into a temporary file beside the target, through a buffer (``out``), then ``commit()``
+    compares it with the existing target : the temporary file replaces the target when they differ, or is discarded
+    otherwise. Thus an unchanged target keeps its modification time, and an interrupted generation never leaves a
+    truncated target.
+
+    Several targets can be written at the same time, e.g. to convert a stream of packages into several formats.
+    """
+
+    def __init__(self, targetName: str, *, binary: bool = False):
+        """
+        Args:
+            targetName (str): the path of the file to generate.
+            binary (bool, optional): when ``True``, the file is opened in binary mode instead of UTF-8 text mode.
+        """
+        self.targetName = targetName
+        directory, basename = os.path.split(targetName)
+        fd, self.temporaryName = tempfile.mkstemp(
+            dir=directory if len(directory) > 0 else ".",
+            prefix=f".{basename}.",
+            suffix=".tmp",
+        )
+        self.out = BufferOfTarget(
+            open(fd, "wb" if binary else "w", encoding=None if binary else "utf-8")
+        )
+
+    def commit(self) -> bool:
+        """
+        Replaces the target by the written content, unless they are the same.
+
+        Returns:
+            bool: ``True`` when the target has been written.
+        """
+        self.out.close()
+        if os.path.isfile(self.targetName) and filecmp.cmp(
+            self.temporaryName, self.targetName, shallow=False
+        ):
+            os.remove(self.temporaryName)
+            return False
+        os.chmod(self.temporaryName, 0o666 & ~currentUmask())
+        os.replace(self.temporaryName, self.targetName)
+        return True
+
+    def discard(self):
+        """
+        Forgets the written content, the target is left untouched.
+        """
+        self.out.chunks = []
+        self.out.close()
+        if os.path.exists(self.temporaryName):
+            os.remove(self.temporaryName)
+
+
+def writeIfChanged(
+    targetName: str, emit: Callable[[IO], None], *, binary: bool = False
+) -> bool:
+    """
+    Generates a target file atomically, and only when its content changes, see ``WriterOfTarget``.
+
+    Args:
+        targetName (str): the path of the file to generate.
+        emit (Callable[[IO], None]): writes the content into the given file.
+        binary (bool, optional): when ``True``, the file is opened in binary mode instead of UTF-8 text mode.
+
+    Returns:
+        bool: ``True`` when the target has been written.
+    """
+    writer = WriterOfTarget(targetName, binary=binary)
+    try:
+        with timedStage("render"):
+            emit(writer.out)
+        with timedStage("write"):
+            return writer.commit()
+    except BaseException:
+        writer.discard()
+        raise
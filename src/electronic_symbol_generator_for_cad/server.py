@@ -0,0 +1,180 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import io
+import json
+import os
+import socketserver
+import sys
+import traceback
+from argparse import ArgumentParser
+from contextlib import redirect_stderr, redirect_stdout
+from typing import TextIO
+
+from .client import (
+    connectToServer,
+    defaultPathOfSocket,
+    isPrivateDirectory,
+    prefixOfForwardedVariables,
+)
+from .cache import CacheOfPackages
+from .sygen import SymbolGeneratorCli
+
+
+def replaceForwardedVariables(env: dict):
+    """
+    Replaces the environment variables read by the generator (``ELSYGEN_*``) by the given ones ; the other variables of
+    the server are kept, and the other given variables are ignored.
+    """
+    for name in list(os.environ):
+        if name.startswith(prefixOfForwardedVariables):
+            del os.environ[name]
+    os.environ.update(
+        {
+            name: value
+            for name, value in env.items()
+            if name.startswith(prefixOfForwardedVariables)
+        }
+    )
+
+
+def handleRequest(request: dict) -> dict:
+    """
+    Runs the generator like ``SymbolGeneratorCli().run(argv)`` would from the working directory and with the environment
+    variables of the client read by the generator (e.g. ``ELSYGEN_CACHE``), both being restored afterwards.
+
+    Args:
+        request (dict): ``{"argv": [...], "cwd": "...", "env": {...}}``, the working directory and the environment being
+            optional ; only the ``ELSYGEN_*`` variables of the environment are used.
+
+    Returns:
+        dict: ``{"status": <exit status>, "output": <everything printed by the generator>}``
+    """
+    output = io.StringIO()
+    cwd = os.getcwd()
+    env = dict(os.environ)
+    try:
+        if "env" in request:
+            replaceForwardedVariables(request["env"])
+        os.chdir(request.get("cwd", cwd))
+        with redirect_stdout(output), redirect_stderr(output):
+            status = SymbolGeneratorCli().run(request["argv"])
+    except SystemExit as exit:  # e.g. invalid arguments, or --help
+        status = exit.code
+    except Exception:
+        output.write(traceback.format_exc())
+        status = 1
+    finally:
+        os.chdir(cwd)
+        replaceForwardedVariables(env)
+    return {
+        "status": 0 if status == None else status,
+        "output": output.getvalue(),
+    }
+
+
+def serveLines(source: TextIO, sink: TextIO):
+    """
+    Answers each JSON request read from a line of ``source`` with a JSON response written as a line into ``sink``.
+    """
+    for line in source:
+        if len(line.strip()) == 0:
+            continue
+        try:
+            response = handleRequest(json.loads(line))
+        except ValueError as error:
+            response = {"status": 2, "output": f"Invalid request : {error}\n"}
+        sink.write(json.dumps(response) + "\n")
+        sink.flush()
+
+
+class HandlerOfConnection(socketserver.StreamRequestHandler):
+    def handle(self):
+        with (
+            io.TextIOWrapper(self.rfile, encoding="utf-8") as source,
+            io.TextIOWrapper(self.wfile, encoding="utf-8") as sink,
+        ):
+            serveLines(source, sink)
+
+
+def serveUnixSocket(pathOfSocket: str):
+    """
+    Listens on the given unix socket ; the requests are processed one after the other, as each one runs from the
+    working directory of its client.
+
+    The directory of the socket is created if needed, and must be private (see ``isPrivateDirectory``) ; the socket is
+    created accessible only to the current user.
+    """
+    directory = os.path.dirname(os.path.abspath(pathOfSocket))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not isPrivateDirectory(directory):
+        raise RuntimeError(
+            f"The directory '{directory}' of the socket is accessible to other users"
+        )
+    if os.path.exists(pathOfSocket):
+        client = connectToServer(pathOfSocket)
+        if client != None:
+            client.close()
+            raise RuntimeError(f"A server is already listening on '{pathOfSocket}'")
+        os.remove(pathOfSocket)  # stale socket
+    umask = os.umask(0o077)
+    try:
+        server = socketserver.UnixStreamServer(pathOfSocket, HandlerOfConnection)
+    finally:
+        os.umask(umask)
+    with server:
+        print(f"Listening on '{pathOfSocket}'...", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(pathOfSocket)
+
+
+def main():
+    parser = ArgumentParser(
+        prog="elsygen-server",
+        description="Keep the symbol generator loaded, and serve conversion requests (JSON lines).",
+    )
+    parser.add_argument(
+        "--socket",
+        action="store",
+        type=str,
+        default=defaultPathOfSocket(),
+        help="path of the unix socket to listen to, in a private directory (default : the ELSYGEN_SOCKET environment variable, or a socket in XDG_RUNTIME_DIR, or else in a per-user directory of the temporary directory).",
+    )
+    parser.add_argument(
+        "--stdio",
+        action="store_true",
+        help="serve the requests read from the standard input instead of listening to a socket.",
+    )
+    args = parser.parse_args()
+    # the packages read through the cache are used again by the next requests
+    CacheOfPackages.keepInMemory()
+    if args.stdio:
+        serveLines(sys.stdin, sys.stdout)
+    else:
+        serveUnixSocket(args.socket)
+
+
+if __name__ == "__main__":
+    main()
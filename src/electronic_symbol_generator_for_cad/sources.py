@@ -0,0 +1,101 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import os
+from glob import iglob
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+# extensions of the catalogs, i.e. the sources having a serialized package on each line
+extensionsOfCatalogs = (".ndjson", ".jsonl")
+
+# extensions of the files that are picked up when walking a directory
+extensionsOfSources = (".md", ".json", ".elsypkg") + extensionsOfCatalogs
+
+
+def isCatalog(name: str) -> bool:
+    return name.endswith(extensionsOfCatalogs)
+
+
+def walkDirectory(
+    path: str, visited: Optional[Set[Tuple[int, int]]] = None
+) -> Iterator[str]:
+    """
+    Yields the source files found under the given directory and its sub-directories, in a reproducible order.
+
+    Only the entries of the directory being walked are held in memory, with the identity (device and inode) of the
+    directories already walked, so that a directory reached again through a symbolic link is skipped instead of looping.
+    Hidden entries are skipped, e.g. the manifests of the incremental mode when the targets are generated beside their
+    sources.
+    """
+    if visited == None:
+        visited = set()
+    stat = os.stat(path)
+    if (stat.st_dev, stat.st_ino) in visited:
+        return
+    visited.add((stat.st_dev, stat.st_ino))
+    with os.scandir(path) as it:
+        entries = sorted(
+            (e for e in it if not e.name.startswith(".")), key=lambda e: e.name
+        )
+    for entry in entries:
+        if entry.is_dir():
+            yield from walkDirectory(entry.path, visited)
+        elif entry.is_file() and entry.name.endswith(extensionsOfSources):
+            yield entry.path
+
+
+def unmatchedSpecs(specs: Iterable[str]) -> List[str]:
+    """
+    The specifications (see ``discoverSources``) that designate nothing, i.e. neither an existing path nor a glob pattern
+    having a match.
+    """
+    return [
+        spec
+        for spec in specs
+        if not os.path.exists(spec) and next(iglob(spec, recursive=True), None) == None
+    ]
+
+
+def discoverSources(specs: Iterable[str]) -> Iterator[str]:
+    """
+    Yields the paths of the source files designated by the given specifications, without opening them.
+
+    A specification is either the path of a file (yielded as is, whatever its extension), the path of a directory (walked
+    recursively) or a glob pattern (each match being handled like a path).
+
+    Raises:
+        FileNotFoundError: when a specification designates nothing, see ``unmatchedSpecs``.
+    """
+    for spec in specs:
+        if os.path.isfile(spec):
+            yield spec
+        elif os.path.isdir(spec):
+            yield from walkDirectory(spec)
+        else:
+            found = False
+            for match in iglob(spec, recursive=True):
+                found = True
+                if os.path.isdir(match):
+                    yield from walkDirectory(match)
+                elif match.endswith(extensionsOfSources):
+                    yield match
+            if not found:
+                raise FileNotFoundError(f"No source file matching '{spec}'")
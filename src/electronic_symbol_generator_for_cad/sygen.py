@@ -19,48 +19,512 @@ If not, see <https://www.gnu.org/licenses/>.
 ---
 """
 
+import io
 import os
-import sys
-from argparse import ArgumentParser, RawDescriptionHelpFormatter, FileType
-from electronic_package_descriptor import (
-    DeserializerOfPackage,
-    ParserOfMarkdownDatasheet,
-    SerializerOfPackage,
+from argparse import (
+    ArgumentParser,
+    ArgumentTypeError,
+    Namespace,
+    RawDescriptionHelpFormatter,
 )
 
-from typing import List, Union, Optional
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 from enum import Enum
 
-from .kicad5 import SymbolGeneratorForKicad5
+from .sources import discoverSources, isCatalog, unmatchedSpecs
+from .timings import RecorderOfTimings, timedStage
+
+# The modules needed by a given output format are imported on demand, so that a short invocation (e.g. `--help`) does
+# not pay for loading the code of every output format.
+if TYPE_CHECKING:
+    from electronic_package_descriptor import PackageDescription
+    from .cache import CacheOfPackages
+    from .incremental import FingerprintOfSource, RegistryOfManifests
 
 
 class OutputFormat(Enum):
     """
     The list of supported output format.
 
-    JSON is the serialization format, whereas the other value are for generation of symbols.
+    JSON and BINARY are the serialization formats, whereas the other value are for generation of symbols.
     """
 
     JSON = "json"
+    BINARY = "binary"
     KICAD5 = "kicad5"
     KICAD6 = "kicad6"
 
 
+# The variants of symbols generated for each package, in the order of the generated library.
+namesOfVariants = (
+    "functionnal_single_unit",
+    "functionnal_multi_unit",
+    "physical_single_unit",
+    "physical_single_unit_socket",
+)
+
+
+def variantsOf(value: str) -> List[str]:
+    """
+    Parses a comma separated list of variants of symbols.
+    """
+    variants = [v.strip() for v in value.split(",") if len(v.strip()) > 0]
+    unknown = [v for v in variants if v not in namesOfVariants]
+    if len(unknown) > 0 or len(variants) == 0:
+        raise ArgumentTypeError(
+            f"unknown variants {unknown}, expected some of {list(namesOfVariants)}"
+        )
+    return variants
+
+
+def formatsOf(value: str) -> List[OutputFormat]:
+    """
+    Parses a comma separated list of output formats.
+    """
+    names = [v.strip() for v in value.split(",") if len(v.strip()) > 0]
+    known = [f.value for f in OutputFormat]
+    unknown = [n for n in names if n not in known]
+    if len(unknown) > 0 or len(names) == 0:
+        raise ArgumentTypeError(f"unknown formats {unknown}, expected some of {known}")
+    return [OutputFormat(n) for n in names]
+
+
+def signatureOfFormat(outputFormat: OutputFormat, variants: Optional[List[str]]) -> str:
+    """
+    The output format and the selected variants, i.e. what a target depends on beside its source.
+    """
+    if variants == None or outputFormat in serializedFormats:
+        return outputFormat.value
+    selected = [v for v in namesOfVariants if v in variants]
+    return f"{outputFormat.value}:{','.join(selected)}"
+
+
 def relocateFileIfNeeded(path: str, into: str) -> str:
     return os.path.join(into, os.path.basename(path)) if into != None else path
 
 
-def prepareWork(s, isJsonSource: bool, extension: str, into: str) -> dict:
-    return {
-        "targetName": relocateFileIfNeeded(
-            f"{s.name[:-5] if isJsonSource else s.name[:-3]}.{extension}", into
-        ),
-        "package": (
-            DeserializerOfPackage().packageFromJsonString("".join(s.readlines()))
-            if isJsonSource
-            else ParserOfMarkdownDatasheet().parseLines(s.readlines())
-        ),
-    }
+extensionByOutputFormat = {
+    OutputFormat.JSON: "json",
+    OutputFormat.BINARY: "elsypkg",
+    OutputFormat.KICAD5: "lib",
+    OutputFormat.KICAD6: "kicad_sym",
+}
+
+# the output formats that can be read back as sources
+serializedFormats = (OutputFormat.JSON, OutputFormat.BINARY)
+
+
+def intoOf(args: Namespace) -> Optional[str]:
+    return None if args.into == None or len(args.into) == 0 else args.into
+
+
+def serializedFormatOf(name: str) -> Optional[OutputFormat]:
+    """
+    The serialization format of the given source, judging by its extension, if any.
+    """
+    for outputFormat in serializedFormats:
+        if name.endswith(f".{extensionByOutputFormat[outputFormat]}"):
+            return outputFormat
+    return None
+
+
+def isConvertible(name: str, outputFormat: OutputFormat) -> bool:
+    """
+    Tells whether the given source would be converted into the given format, judging by its extension.
+    """
+    if name.endswith(".md"):
+        return True
+    if isCatalog(name):
+        return outputFormat not in serializedFormats
+    formatOfSource = serializedFormatOf(name)
+    return formatOfSource != None and formatOfSource != outputFormat
+
+
+def targetNameOf(name: str, outputFormat: OutputFormat, into: Optional[str]) -> str:
+    return relocateFileIfNeeded(
+        f"{os.path.splitext(name)[0]}.{extensionByOutputFormat[outputFormat]}",
+        into,
+    )
+
+
+def loadPackage(
+    name: str,
+    formatOfSource: Optional[OutputFormat],
+    cache: Optional["CacheOfPackages"] = None,
+) -> Tuple["PackageDescription", "FingerprintOfSource"]:
+    """
+    Parses the markdown datasheet or deserializes the serialized source, unless the package is found in the cache.
+
+    A binary source is decoded straight from the file, its decoding is as fast as reading the cache. The fingerprint of
+    the content actually read is returned along the package, for the manifests of the incremental mode.
+    """
+    import hashlib
+    from .incremental import fingerprintOf
+
+    hash = hashlib.sha256()
+    with open(name, "rb") as f:
+        stat = os.fstat(f.fileno())
+        if formatOfSource == OutputFormat.BINARY:
+            from .binary import loadBinaryPackage
+
+            return loadBinaryPackage(f, hash), fingerprintOf(stat, hash)
+        raw = f.read()
+    hash.update(raw)
+    fingerprint = fingerprintOf(stat, hash)
+
+    from electronic_package_descriptor import (
+        DeserializerOfPackage,
+        ParserOfMarkdownDatasheet,
+    )
+
+    isJsonSource = formatOfSource == OutputFormat.JSON
+    s = io.TextIOWrapper(io.BytesIO(raw))  # decoded like ``open(name, "r")`` would
+    lines = None if isJsonSource else s.readlines()
+    content = s.read() if isJsonSource else "".join(lines)
+    if cache != None:
+        key = cache.keyOf("json" if isJsonSource else "md", content)
+        package = cache.get(key)
+        if package != None:
+            return package, fingerprint
+    package = (
+        DeserializerOfPackage().packageFromJsonString(content)
+        if isJsonSource
+        else ParserOfMarkdownDatasheet().parseLines(lines)
+    )
+    if cache != None:
+        cache.put(key, package)
+    return package, fingerprint
+
+
+def cacheOf(args: Namespace) -> Optional["CacheOfPackages"]:
+    if args.cache == None:
+        return None
+    from .cache import CacheOfPackages
+
+    return CacheOfPackages(args.cache, args.cache_size * 1024 * 1024)
+
+
+class OutcomeOfConversion(NamedTuple):
+    """
+    The result of the conversion of a source file into one of the output formats.
+    """
+
+    targetName: str
+    written: bool
+    timings: Optional[Dict[str, object]] = None
+    signature: Optional[str] = None  # the output format and the variants of the target
+    fingerprint: Optional["FingerprintOfSource"] = None  # of the content converted
+
+
+def pathOfProfile(directory: str, name: str) -> str:
+    """
+    The path of the profile of the conversion of the given source, inside the given directory.
+    """
+    flattened = os.path.normpath(name).lstrip(os.sep).replace(os.sep, "__")
+    return os.path.join(directory, flattened + ".prof")
+
+
+def convertSource(
+    name: str,
+    args: Namespace,
+    *,
+    upToDate: bool = False,
+    log: Callable[[str], None] = print,
+) -> List[OutcomeOfConversion]:
+    """
+    Convert a single source file into each output format, as specified by the parsed command line arguments.
+
+    Args:
+        name (str): the path of the source file.
+        args (Namespace): the parsed command line arguments.
+        upToDate (bool, optional): when ``True``, the targets are known to be up to date and are not generated again.
+        log (Callable[[str], None], optional): where to report progress messages. Defaults to ``print``.
+
+    Returns:
+        List[OutcomeOfConversion]: for each generated target, its name, whether it has been actually written, i.e. its
+        content changed, and the timings of its generation when requested.
+    """
+    if args.profile == None or args.profile_per != "file" or upToDate:
+        return convertSourceTimed(name, args, upToDate=upToDate, log=log)
+    import cProfile
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(
+            convertSourceTimed, name, args, upToDate=upToDate, log=log
+        )
+    finally:
+        os.makedirs(args.profile, exist_ok=True)
+        profiler.dump_stats(pathOfProfile(args.profile, name))
+
+
+def convertSourceTimed(
+    name: str,
+    args: Namespace,
+    *,
+    upToDate: bool = False,
+    log: Callable[[str], None] = print,
+) -> List[OutcomeOfConversion]:
+    outcomes = []
+    stages = convertSourceStages(name, args, upToDate=upToDate, log=log)
+    while True:
+        # each target has its own recorder, the parsing of the source is accounted to the first target
+        recorder = RecorderOfTimings()
+        with recorder.activated():
+            converted = next(stages, None)
+        if converted == None:
+            return outcomes
+        outputFormat, targetName, written, fingerprint = converted
+        timings = None
+        if args.timings != None:
+            timings = {
+                "source": name,
+                "target": targetName,
+                "format": outputFormat.value,
+                "written": written,
+                "total": sum(recorder.stages.values()),
+                "stages": recorder.stages,
+                "variants": recorder.variants,
+            }
+        outcomes.append(
+            OutcomeOfConversion(
+                targetName,
+                written,
+                timings,
+                signatureOfFormat(outputFormat, args.variants),
+                fingerprint,
+            )
+        )
+
+
+def convertSourceStages(
+    name: str,
+    args: Namespace,
+    *,
+    upToDate: bool = False,
+    log: Callable[[str], None] = print,
+) -> Iterator[Tuple[OutputFormat, str, bool, "FingerprintOfSource"]]:
+    """
+    Yields, for each output format, the format, the name of the target, whether it has been written and the fingerprint
+    of the content of the source that has been converted.
+
+    The source is parsed once, then the package is handed to the generator of each format ; the Kicad formats share
+    the geometry of the symbols.
+    """
+    # checks input format by extension
+    formatOfSource = serializedFormatOf(name)
+    if formatOfSource != None:
+        log(f"File '{name}' is deserializable.")
+    elif isCatalog(name):
+        log(f"File '{name}' is a catalog of packages.")
+    elif name.endswith(".md"):
+        log(f"File '{name}' is processable.")
+    else:
+        log(f"File '{name}' is not processable, skip...")
+        return
+    formats = [f for f in args.format if isConvertible(name, f)]
+    if len(formats) < len(args.format):
+        log(f"Skipping already serialized file {name}")
+    if len(formats) == 0:
+        return
+
+    # do the processing
+    into = intoOf(args)
+    if upToDate:
+        for outputFormat in formats:
+            log(f"'{targetNameOf(name, outputFormat, into)}' is up to date, skip...")
+        return
+    if isCatalog(name):
+        yield from convertCatalogStages(name, formats, args, log=log)
+        return
+    from .outputs import writeIfChanged
+
+    log(f"load datasheet or deserialize source...")
+    with timedStage("parse"):
+        package, fingerprint = loadPackage(name, formatOfSource, cacheOf(args))
+
+    layouts = None
+    for outputFormat in formats:
+        targetName = targetNameOf(name, outputFormat, into)
+        if outputFormat == OutputFormat.JSON:
+            from electronic_package_descriptor import SerializerOfPackage
+
+            log(f"serialize into {targetName}...")
+            with timedStage("render"):
+                serialized = SerializerOfPackage().jsonFrom(package)
+            emit = lambda outfile: outfile.write(serialized)
+        elif outputFormat == OutputFormat.BINARY:
+            from .binary import binaryFrom
+
+            log(f"encode into {targetName}...")
+            with timedStage("render"):
+                encoded = binaryFrom(package)
+            emit = lambda outfile: outfile.write(encoded)
+        else:
+            SymbolGenerator = symbolGeneratorClassOf(outputFormat)
+            if layouts == None:
+                from .engine import CacheOfLayouts
+
+                layouts = CacheOfLayouts()
+            log(f"generate {targetName}...")
+            emit = SymbolGenerator(
+                package, variants=args.variants, layouts=layouts
+            ).emitSymbolSet
+        written = writeIfChanged(
+            targetName, emit, binary=outputFormat == OutputFormat.BINARY
+        )
+        yield outputFormat, targetName, written, fingerprint
+
+
+def symbolGeneratorClassOf(outputFormat: OutputFormat) -> type:
+    """
+    The generator of the symbols of the given format, the modules of the other formats are not loaded.
+    """
+    if outputFormat == OutputFormat.KICAD5:
+        from .kicad5 import SymbolGeneratorForKicad5
+
+        return SymbolGeneratorForKicad5
+    # outputFormat == OutputFormat.KICAD6
+    from .kicad6 import SymbolGeneratorForKicad6
+
+    return SymbolGeneratorForKicad6
+
+
+def convertCatalogStages(
+    name: str,
+    formats: List[OutputFormat],
+    args: Namespace,
+    *,
+    log: Callable[[str], None] = print,
+) -> Iterator[Tuple[OutputFormat, str, bool, "FingerprintOfSource"]]:
+    """
+    Converts a catalog into one library of symbols per format, named after the catalog, like ``convertSourceStages``.
+
+    The packages are streamed : each package is deserialized, converted into every format, then forgotten ; thus the
+    memory is bounded by the largest package. The targets are written at the same time, they are all generated before
+    the first one is yielded.
+    """
+    import hashlib
+    from .catalogs import packagesOfCatalog
+    from .engine import CacheOfLayouts
+    from .incremental import fingerprintOf
+    from .outputs import WriterOfTarget
+
+    into = intoOf(args)
+    nameOfLibrary = os.path.splitext(os.path.basename(name))[0]
+    generatorClasses = [symbolGeneratorClassOf(f) for f in formats]
+    log(f"stream the packages of the catalog, generate the libraries...")
+    writers = []
+    try:
+        for outputFormat in formats:
+            writers.append(WriterOfTarget(targetNameOf(name, outputFormat, into)))
+        with timedStage("render"):
+            for SymbolGenerator, writer in zip(generatorClasses, writers):
+                SymbolGenerator.emitBeginOfSymbolSet(writer.out, nameOfLibrary)
+        hash = hashlib.sha256()
+        with open(name, "rb") as f:
+            stat = os.fstat(f.fileno())
+            for package in packagesOfCatalog(f, log=log, hash=hash):
+                # shared by the formats, forgotten with the package
+                layouts = CacheOfLayouts()
+                with timedStage("render"):
+                    for SymbolGenerator, writer in zip(generatorClasses, writers):
+                        SymbolGenerator(
+                            package, variants=args.variants, layouts=layouts
+                        ).emitSymbols(writer.out)
+        fingerprint = fingerprintOf(stat, hash)
+        with timedStage("render"):
+            for SymbolGenerator, writer in zip(generatorClasses, writers):
+                SymbolGenerator.emitEndOfSymbolSet(writer.out)
+        with timedStage("write"):
+            written = [writer.commit() for writer in writers]
+    except BaseException:
+        for writer in writers:
+            writer.discard()
+        raise
+    for outputFormat, writer, wasWritten in zip(formats, writers, written):
+        yield outputFormat, writer.targetName, wasWritten, fingerprint
+
+
+def isUpToDate(name: str, args: Namespace, manifests: "RegistryOfManifests") -> bool:
+    """
+    Tells whether the targets of the source are up to date in every output format it is convertible into.
+    """
+    into = intoOf(args)
+    formats = [f for f in args.format if isConvertible(name, f)]
+    return len(formats) > 0 and all(
+        manifests.isUpToDate(
+            name,
+            targetNameOf(name, f, into),
+            signatureOfFormat(f, args.variants),
+        )
+        for f in formats
+    )
+
+
+def convertSourceInWorker(
+    task: Tuple[str, bool], args: Namespace
+) -> Tuple[List[str], Optional[Exception], List[OutcomeOfConversion]]:
+    """
+    Wraps ``convertSource`` for a worker process : the messages are collected instead of printed, and a failure is
+    returned instead of raised, so that the caller can report both in the order of the sources.
+
+    The task is the name of the source and whether its targets are up to date.
+    """
+    name, upToDate = task
+    messages = []
+    try:
+        converted = convertSource(name, args, upToDate=upToDate, log=messages.append)
+    except Exception as error:
+        return messages, error, []
+    return messages, None, converted
+
+
+def mapInOrder(
+    fn: Callable,
+    items: Iterable,
+    *extraArgs,
+    jobs: int,
+    inline: Callable[[object], bool] = lambda item: False,
+) -> Iterator:
+    """
+    Calls ``fn(item, *extraArgs)`` for each item using a pool of ``jobs`` processes, and yields the pairs ``(item,
+    result)`` in the order of the items.
+
+    The number of pending calls is bounded, so that the items can be streamed. Items for which ``inline(item)`` is true
+    are cheap to process, they are processed by the calling process instead of being sent to the pool.
+    """
+    from collections import deque
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        pending = deque()
+        for item in items:
+            if inline(item):
+                future = Future()
+                future.set_result(fn(item, *extraArgs))
+            else:
+                future = executor.submit(fn, item, *extraArgs)
+            pending.append((item, future))
+            if len(pending) >= 4 * jobs:
+                item, future = pending.popleft()
+                yield item, future.result()
+        while len(pending) > 0:
+            item, future = pending.popleft()
+            yield item, future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
 
 
 class SymbolGeneratorCli:
@@ -96,18 +560,25 @@ If not, see <https://www.gnu.org/licenses/>. 
         parser.add_argument(
             "sources",
             metavar="source files",
-            type=FileType("r"),
+            type=str,
             nargs="+",
-            help="a list of source files",
+            help="a list of source files, directories (walked recursively) or glob patterns",
         )
 
         parser.add_argument(
             "-f",
             "--format",
-            action="store",
-            type=OutputFormat,
+            action="extend",
+            type=formatsOf,
             required=True,
-            help=f"format of the output file : {[f.value for f in OutputFormat]}",
+            help=f"format of the output files, repeatable or comma separated, among {[f.value for f in OutputFormat]} ; each source is parsed once for all the formats.",
+        )
+        parser.add_argument(
+            "--variants",
+            action="store",
+            type=variantsOf,
+            required=False,
+            help=f"comma separated list of the variants of symbols to generate, among {list(namesOfVariants)} (default : all).",
         )
         parser.add_argument(
             "--into",
@@ -116,59 +587,153 @@ If not, see <https://www.gnu.org/licenses/>. 
             required=False,
             help="directory where output files will be generated.",
         )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            action="store",
+            type=int,
+            default=1,
+            required=False,
+            help="number of worker processes converting the source files, 0 to use all the available processors (default : 1).",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="skip the sources whose target is up to date, according to the manifest kept beside the targets.",
+        )
+        parser.add_argument(
+            "--cache",
+            action="store",
+            type=str,
+            default=os.environ.get("ELSYGEN_CACHE"),
+            required=False,
+            help="directory of the cache of parsed packages (default : the ELSYGEN_CACHE environment variable, if set).",
+        )
+        parser.add_argument(
+            "--cache-size",
+            action="store",
+            type=int,
+            default=256,
+            required=False,
+            help="maximal size of the cache of parsed packages, in MiB (default : 256).",
+        )
+        parser.add_argument(
+            "--timings",
+            action="store",
+            type=str,
+            required=False,
+            help="file where to write, for each converted source, a JSON line with the time spent in each stage and variant.",
+        )
+        parser.add_argument(
+            "--profile",
+            action="store",
+            type=str,
+            required=False,
+            help="directory where to write the cProfile dumps of the conversions, to be read with pstats or snakeviz.",
+        )
+        parser.add_argument(
+            "--profile-per",
+            action="store",
+            choices=["file", "run"],
+            default="file",
+            required=False,
+            help="write a profile for each source file, or a single one for the whole run (default : file).",
+        )
         return parser
 
     def __init__(self):
         pass
 
-    def run(self) -> Optional[int]:
-        args = SymbolGeneratorCli.createArgParser().parse_args()
-
-        sources = args.sources
-
-        for s in sources:
-            # checks input format by extension
-            isJsonSource = False
-            if s.name.endswith(".json"):
-                print(f"File '{s.name}' is deserializable.")
-                isJsonSource = True
-                if args.format == OutputFormat.JSON:
-                    print(f"Skipping already serialized file {s.name}")
-                    continue
-            elif s.name.endswith(".md"):
-                print(f"File '{s.name}' is processable.")
-            else:
-                print(f"File '{s.name}' is not processable, skip...")
-                continue
-
-            # do the processing
-            into = None if args.into == None or len(args.into) == 0 else args.into
-            if args.format == OutputFormat.JSON:
-                if isJsonSource:
-                    print(f"skip already serialized file '{s.name}'")
-                    continue
-                targetName = relocateFileIfNeeded(s.name[:-3] + ".json", into)
-                print(f"load datasheet and serialize into {targetName}...")
-                serialized = SerializerOfPackage().jsonFrom(
-                    ParserOfMarkdownDatasheet().parseLines(s.readlines())
-                )
-                with open(targetName, "w") as outfile:
-                    outfile.write(serialized)
-            elif args.format == OutputFormat.KICAD5:
-                print(f"load datasheet or deserialize json, generate '*.lib'...")
-                work = prepareWork(s, isJsonSource, "lib", into)
-                with open(work["targetName"], "w") as outfile:
-                    SymbolGeneratorForKicad5(work["package"]).emitSymbolSet(outfile)
-            else:  # args.format == OutputFormat.KICAD6:
-                print(f"load datasheet or deserialize json, generate '*.kycad_sym'...")
-                raise RuntimeError("Not implemented yet !")
-                targetName = relocateFileIfNeeded(
-                    f"{s.name[:-5] if isJsonSource else s.name[:-3]}.kycad_sym", into
-                )
-                p = (
-                    DeserializerOfPackage.packageFromJsonString("".join(s.readlines()))
-                    if isJsonSource
-                    else ParserOfMarkdownDatasheet().parseLines(s.readlines())
+    def run(self, argv: Optional[List[str]] = None) -> Optional[int]:
+        parser = SymbolGeneratorCli.createArgParser()
+        args = parser.parse_args(argv)
+        args.format = list(dict.fromkeys(args.format))  # without duplicates, in order
+        unmatched = unmatchedSpecs(args.sources)
+        if len(unmatched) > 0:
+            parser.error(
+                f"no source file matching {', '.join(repr(spec) for spec in unmatched)}"
+            )
+
+        # sources are discovered lazily, each file is opened only while it is converted
+        sources = discoverSources(args.sources)
+        manifests = None
+        if args.incremental:
+            from .incremental import RegistryOfManifests
+
+            manifests = RegistryOfManifests()
+        tasks = (
+            (name, isUpToDate(name, args, manifests) if manifests != None else False)
+            for name in sources
+        )
+
+        countOfWritten = 0
+        countOfUntouched = 0
+
+        timings = None
+        if args.timings != None:
+            import json
+
+            timings = open(args.timings, "w", encoding="utf-8")
+
+        def account(name: str, upToDate: bool, converted: List[OutcomeOfConversion]):
+            nonlocal countOfWritten, countOfUntouched
+            if upToDate:
+                countOfUntouched += len(
+                    [f for f in args.format if isConvertible(name, f)]
                 )
+            for outcome in converted:
+                if outcome.written:
+                    countOfWritten += 1
+                else:
+                    countOfUntouched += 1
+                if manifests != None:
+                    manifests.record(
+                        name, outcome.targetName, outcome.signature, outcome.fingerprint
+                    )
+                if timings != None:
+                    timings.write(json.dumps(outcome.timings) + "\n")
 
+        profiler = None
+        if args.profile != None and args.profile_per == "run":
+            import cProfile
+
+            # with several jobs, only the work done by the main process is profiled
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            if args.jobs == 1:
+                for name, upToDate in tasks:
+                    account(
+                        name, upToDate, convertSource(name, args, upToDate=upToDate)
+                    )
+            else:
+                jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+                for (name, upToDate), (messages, error, converted) in mapInOrder(
+                    convertSourceInWorker,
+                    tasks,
+                    args,
+                    jobs=jobs,
+                    inline=lambda task: task[1],
+                ):
+                    for message in messages:
+                        print(message)
+                    if error != None:
+                        raise error
+                    account(name, upToDate, converted)
+        finally:
+            if profiler != None:
+                profiler.disable()
+                os.makedirs(args.profile, exist_ok=True)
+                profiler.dump_stats(os.path.join(args.profile, "run.prof"))
+            if timings != None:
+                timings.close()
+            if manifests != None:
+                manifests.save()
+            cache = cacheOf(args)
+            if cache != None:
+                cache.evict()
+
+        print(
+            f"{countOfWritten} file(s) written, {countOfUntouched} file(s) left untouched."
+        )
         print("Done")
@@ -19,20 +19,36 @@ If not, see <https://www.gnu.org/licenses/>.
 ---
 """
 
-from typing import List, Dict
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from electronic_package_descriptor import PackageDescription
 
+from .engine import (
+    CacheOfLayouts,
+    GeometryOfSymbol,
+    RectangleOfSymbol,
+    TextOfSymbol,
+    UnitOfSymbol,
+    geometryOf,
+)
+from .engine.metrics import metrics
+from .timings import timedStage
+
 
 def writeLinesWithSeparator(out, lines: List[str]):
     """
-    This utilities wraps ``out.writelines(line + '\n' for line in lines)``.
+    This utilities writes ``''.join(line + '\n' for line in lines)`` into ``out``.
 
     Python breaks my expectations regarding semantics of what is a line of text.
 
     As a Java developper, I expect line separator to be NOT part of a line (noise). Python expect line separator to be part of a line (signal).
+
+    The lines are assembled and written at once.
     """
-    out.writelines(line + "\n" for line in lines)
+    lines = list(lines)
+    if len(lines) > 0:
+        out.write("\n".join(lines) + "\n")
 
 
 class SymbolGenerator:
@@ -47,7 +63,7 @@ class SymbolGenerator:
         pass
 
     @property
-    def symbolSet(self) -> Dict[str, List[str]]:
+    def symbolSet(self) -> Mapping[str, List[str]]:
         """
         A symbol generator create a set of symbol for a particular tool that uses a text file format to import them.
 
@@ -55,9 +71,37 @@ class SymbolGenerator:
         """
         return {}
 
+    def invalidate(self):
+        """
+        Forgets everything computed from the package description, to be called after modifying it.
+        """
+        pass
+
     def emitSymbolSet(self, out):
         """
         The generator will stream the set of symbols using ``out.write(...)``.
+
+        Each symbol is written as soon as it is rendered, the set of symbols is never held in memory as a whole.
+        """
+        pass
+
+    @classmethod
+    def emitBeginOfSymbolSet(cls, out, name: str):
+        """
+        Streams the prolog of a library of symbols having the given name, to combine the symbols of several packages.
+        """
+        pass
+
+    def emitSymbols(self, out):
+        """
+        Streams the symbols of the package, without the prolog and the epilog of the library.
+        """
+        pass
+
+    @classmethod
+    def emitEndOfSymbolSet(cls, out):
+        """
+        Streams the epilog of a library of symbols.
         """
         pass
 
@@ -67,6 +111,9 @@ class SingleSymbolGenerator:
     A delegate that generate a single symbol.
     """
 
+    # the lines of the symbol, once rendered
+    rendered: Optional[List[str]] = None
+
     def __init__(self, p: PackageDescription):
         pass
 
@@ -74,9 +121,35 @@ class SingleSymbolGenerator:
     def symbol(self) -> List[str]:
         """
         A single symbol is a set of lines of text describing the symbol using the syntax of the supported CAD software.
+
+        The symbol is rendered on first access, then kept until ``invalidate()`` is called.
+        """
+        if self.rendered == None:
+            self.rendered = self.renderSymbol()
+        return self.rendered
+
+    def renderSymbol(self) -> List[str]:
+        """
+        Renders the lines of the symbol, to implement.
         """
         return []
 
+    def invalidate(self):
+        """
+        Forgets the rendered symbol, to be called after modifying the package description.
+        """
+        self.rendered = None
+
+    def emitSymbol(self, out):
+        """
+        The generator will stream the symbol using ``out.write(...)``.
+
+        Only the lines of this symbol are held in memory : a symbol that was not rendered yet is not kept.
+        """
+        writeLinesWithSeparator(
+            out, self.rendered if self.rendered != None else self.renderSymbol()
+        )
+
     @property
     def suffix(self) -> str:
         return ""
@@ -84,3 +157,105 @@ class SingleSymbolGenerator:
     @property
     def title(self) -> str:
         return f"{self.p.name}"
+
+
+class SingleSymbolGeneratorOfGeometry(SingleSymbolGenerator):
+    """
+    A delegate that serializes the geometry of a variant of symbol (see ``engine.geometry``), computed by ``build``.
+
+    The geometry is kept in the cache of layouts, thus computed once for every output format sharing this cache. An
+    output format implements the ``to*`` methods and ``renderSymbol``.
+    """
+
+    build: Callable[[PackageDescription, CacheOfLayouts, int], GeometryOfSymbol]
+
+    # every pin is emitted as passive, e.g. for sockets
+    forcePassive = False
+
+    # the records of the pins are kept in the cache of layouts, for the variants having the same geometry
+    shareRecordsOfPins = False
+
+    def __init__(
+        self,
+        p: PackageDescription,
+        m: Dict[str, int] = metrics,
+        layouts: CacheOfLayouts = None,
+    ):
+        self.p = p
+        self.metrics = m
+        self.layouts = layouts if layouts != None else CacheOfLayouts()
+
+    @property
+    def name(self) -> str:
+        return (self.p.name + self.suffix).upper()
+
+    @property
+    def geometry(self) -> GeometryOfSymbol:
+        with timedStage("layout"):
+            return geometryOf(
+                type(self).build, self.p, self.layouts, self.metrics["spacing"]
+            )
+
+    def toText(self, text: TextOfSymbol, unit: int) -> List[str]:
+        return []
+
+    def toRectangle(self, rectangle: RectangleOfSymbol, unit: int) -> List[str]:
+        return []
+
+    def toRecordsOfPins(self, unit: UnitOfSymbol) -> List[Tuple[str, str]]:
+        """
+        Each pin of the unit as a record of its line without its type, and the value of its type.
+        """
+        return []
+
+    def toLinesOfRecords(
+        self, records: List[Tuple[str, str]], *, forcePassive: bool = False
+    ) -> List[str]:
+        return []
+
+    def recordsOfPins(self, unit: UnitOfSymbol) -> List[Tuple[str, str]]:
+        if not self.shareRecordsOfPins:
+            return self.toRecordsOfPins(unit)
+        return self.layouts.derivedOf(
+            (
+                type(self).toRecordsOfPins,
+                type(self).build,
+                self.p,
+                self.metrics["spacing"],
+                unit.unit,
+            ),
+            lambda: self.toRecordsOfPins(unit),
+        )
+
+    def renderUnit(self, unit: UnitOfSymbol, result: List[str]):
+        for text in unit.texts:
+            result.extend(self.toText(text, unit.unit))
+        for rectangle in unit.rectangles:
+            result.extend(self.toRectangle(rectangle, unit.unit))
+        result.extend(
+            self.toLinesOfRecords(
+                self.recordsOfPins(unit), forcePassive=self.forcePassive
+            )
+        )
+
+    def invalidate(self):
+        super().invalidate()
+        self.layouts.clear()
+
+
+class SetOfSymbols(Mapping):
+    """
+    The symbols of a set of generators, by key ; each symbol is only rendered when its key is accessed, at most once.
+    """
+
+    def __init__(self, generators: Dict[str, SingleSymbolGenerator]):
+        self.generators = generators
+
+    def __getitem__(self, key: str) -> List[str]:
+        return self.generators[key].symbol
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.generators)
+
+    def __len__(self) -> int:
+        return len(self.generators)
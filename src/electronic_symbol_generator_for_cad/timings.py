@@ -0,0 +1,93 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+currentRecorder: ContextVar[Optional["RecorderOfTimings"]] = ContextVar(
+    "currentRecorder", default=None
+)
+
+
+class RecorderOfTimings:
+    """
+    Collects the wall time spent in each stage of a conversion (e.g. parse, layout, render, write), and in each
+    generated variant of symbol.
+
+    Stages can be nested, the time of a stage excludes the time of the stages nested into it ; thus the sum of the
+    stages is the total time. The time of a variant includes everything done for it.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.variants: Dict[str, float] = {}
+        self.nested = []  # for each running stage, the time spent in its nested stages
+
+    @contextmanager
+    def stage(self, name: str):
+        self.nested.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nestedTime = self.nested.pop()
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed - nestedTime
+            if len(self.nested) > 0:
+                self.nested[-1] += elapsed
+
+    @contextmanager
+    def variant(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.variants[name] = self.variants.get(name, 0.0) + elapsed
+
+    @contextmanager
+    def activated(self):
+        """
+        Makes this recorder the one used by ``timedStage`` and ``timedVariant``.
+        """
+        token = currentRecorder.set(self)
+        try:
+            yield self
+        finally:
+            currentRecorder.reset(token)
+
+
+def timedStage(name: str):
+    """
+    Context manager timing a stage into the current recorder, if any.
+    """
+    recorder = currentRecorder.get()
+    return nullcontext() if recorder == None else recorder.stage(name)
+
+
+def timedVariant(name: str):
+    """
+    Context manager timing a variant of symbol into the current recorder, if any.
+    """
+    recorder = currentRecorder.get()
+    return nullcontext() if recorder == None else recorder.variant(name)
@@ -0,0 +1,147 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import os
+import shutil
+import time
+import sys
+from unittest.mock import patch
+
+from .utils import makeTmpDirOrDie, assert_that_source_is_converted_as_expected
+
+from electronic_symbol_generator_for_cad import SymbolGeneratorCli
+from electronic_symbol_generator_for_cad.cache import CacheOfPackages
+import electronic_package_descriptor
+
+input_file = "pal20r6.md"
+output_file = "pal20r6.lib"
+
+
+def test_that_parsed_packages_are_reused_from_the_cache():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.cache")
+    cache_dir = os.path.join(tmp_dir, "cache")
+    testargs = [
+        "prog",
+        "--format",
+        "kicad5",
+        "--cache",
+        cache_dir,
+        "--into",
+        tmp_dir,
+        os.path.join(".", "tests", "data", input_file),
+    ]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+        assert len(os.listdir(cache_dir)) == 1
+
+        # second run must not parse the datasheet again, even in a new process
+        os.remove(os.path.join(tmp_dir, output_file))
+        with patch.object(
+            electronic_package_descriptor, "ParserOfMarkdownDatasheet"
+        ) as parser:
+            SymbolGeneratorCli().run()
+            parser.assert_not_called()
+        assert_that_source_is_converted_as_expected(
+            os.path.join(tmp_dir, output_file),
+            os.path.join(".", "tests", "data.expected", output_file),
+        )
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_the_cache_is_bounded():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.cache-size")
+    cache_dir = os.path.join(tmp_dir, "cache")
+    testargs = [
+        "prog",
+        "--format",
+        "kicad5",
+        "--cache",
+        cache_dir,
+        "--cache-size",
+        "0",
+        "--into",
+        tmp_dir,
+        os.path.join(".", "tests", "data", input_file),
+    ]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+        assert len(os.listdir(cache_dir)) == 0
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_an_untrusted_cache_is_ignored(capsys):
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.cache-untrusted")
+    cache_dir = os.path.join(tmp_dir, "cache")
+    testargs = [
+        "prog",
+        "--format",
+        "kicad5",
+        "--cache",
+        cache_dir,
+        "--into",
+        tmp_dir,
+        os.path.join(".", "tests", "data", input_file),
+    ]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+        assert len(os.listdir(cache_dir)) == 1
+        os.chmod(cache_dir, 0o777)
+        capsys.readouterr()
+
+        # the entries of a directory writable by other users are not unpickled
+        with patch.object(
+            electronic_package_descriptor,
+            "ParserOfMarkdownDatasheet",
+            wraps=electronic_package_descriptor.ParserOfMarkdownDatasheet,
+        ) as parser:
+            SymbolGeneratorCli().run()
+            parser.assert_called()
+        assert "is not owned by the current user" in capsys.readouterr().out
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_the_packages_kept_in_memory_are_copies():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.cache-memory")
+    cache = CacheOfPackages(os.path.join(tmp_dir, "cache"))
+    with open(os.path.join(".", "tests", "data", input_file), encoding="utf-8") as f:
+        package = electronic_package_descriptor.ParserOfMarkdownDatasheet().parseLines(
+            f.read().splitlines()
+        )
+    key = cache.keyOf("md", package.name)
+
+    # a one-shot run reads the packages from the directory only
+    assert CacheOfPackages.memory == None
+    cache.put(key, package)
+    assert CacheOfPackages.memory == None
+
+    CacheOfPackages.keepInMemory(1)
+    try:
+        first = cache.get(key)
+        shutil.rmtree(os.path.join(tmp_dir, "cache"))
+        second = cache.get(key)  # from memory
+        assert second != None and second is not first
+        first.name = "CHANGED"
+        assert cache.get(key).name == package.name
+        cache.put(cache.keyOf("md", "other"), package)
+        assert len(CacheOfPackages.memory) == 1
+    finally:
+        CacheOfPackages.memory = None
+    shutil.rmtree(tmp_dir)
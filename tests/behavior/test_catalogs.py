@@ -0,0 +1,104 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import json
+import os
+import shutil
+import time
+import sys
+from unittest.mock import patch
+
+from .utils import makeTmpDirOrDie
+
+from electronic_symbol_generator_for_cad import SymbolGeneratorCli
+
+input_files = [
+    "dac0802.md",
+    "dram-256Kx1.md",
+    "mc_68000_plcc68.md",
+    "pal20r6.md",
+    "simm-30.md",
+]
+
+
+def symbolsOf(path: str, lengthOfProlog: int, lengthOfEpilog: int) -> str:
+    with open(path) as f:
+        lines = f.readlines()
+    return "".join(lines[lengthOfProlog : len(lines) - lengthOfEpilog])
+
+
+def test_that_a_catalog_is_converted_into_one_library_per_format(capsys):
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.catalog")
+    tmp_packages = os.path.join(tmp_dir, "packages")
+    os.mkdir(tmp_packages)
+
+    # each package, alone
+    testargs = ["prog", "--format", "json", "--into", tmp_packages] + [
+        os.path.join(".", "tests", "data", f) for f in input_files
+    ]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+    sources = [
+        os.path.join(tmp_packages, f"{os.path.splitext(f)[0]}.json")
+        for f in input_files
+    ]
+    testargs = ["prog", "--format", "kicad5,kicad6", "--into", tmp_packages]
+    with patch.object(sys, "argv", testargs + sources):
+        SymbolGeneratorCli().run()
+
+    # the same packages, in a catalog having a blank line and an unreadable line
+    tmp_catalog = os.path.join(tmp_dir, "parts.ndjson")
+    with open(tmp_catalog, "w") as catalog:
+        for i, source in enumerate(sources):
+            with open(source) as f:
+                catalog.write(json.dumps(json.load(f), ensure_ascii=False) + "\n")
+            if i == 1:
+                catalog.write("\n")
+                catalog.write('{"meta": {"name": "broken"}}\n')
+    capsys.readouterr()
+    testargs = ["prog", "--format", "kicad5,kicad6,json", "--into", tmp_dir]
+    with patch.object(sys, "argv", testargs + [tmp_catalog]):
+        SymbolGeneratorCli().run()
+    out = capsys.readouterr().out
+    assert "WARN -- " in out and "line 4" in out
+    assert "2 file(s) written" in out
+    assert not os.path.exists(os.path.join(tmp_dir, "parts.json"))
+
+    basenames = [os.path.splitext(f)[0] for f in input_files]
+    with open(os.path.join(tmp_dir, "parts.lib")) as f:
+        assert f.read() == (
+            "EESchema-LIBRARY Version 2.4\n#encoding utf-8\n#\n#\n# Symbol set of : parts\n#\n"
+            + "".join(
+                symbolsOf(os.path.join(tmp_packages, f"{b}.lib"), 6, 2)
+                for b in basenames
+            )
+            + "#\n#End Library\n"
+        )
+    with open(os.path.join(tmp_dir, "parts.kicad_sym")) as f:
+        assert f.read() == (
+            "(kicad_symbol_lib (version 20211014) (generator elsygen)\n"
+            + "".join(
+                symbolsOf(os.path.join(tmp_packages, f"{b}.kicad_sym"), 1, 1)
+                for b in basenames
+            )
+            + ")\n"
+        )
+    shutil.rmtree(tmp_dir)
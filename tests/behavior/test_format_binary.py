@@ -0,0 +1,124 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import os
+import shutil
+import time
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from .utils import makeTmpDirOrDie, assert_that_source_is_converted_as_expected
+
+from electronic_symbol_generator_for_cad import SymbolGeneratorCli
+from electronic_symbol_generator_for_cad.binary import (
+    binaryFrom,
+    loadBinaryPackage,
+    packageFromBinary,
+)
+
+input_files = [
+    "dac0802.md",
+    "dram-256Kx1.md",
+    "mc_68000_plcc68.md",
+    "lf347.json",
+    "pal20r6.md",
+    "simm-30.md",
+]
+
+
+def test_that_binary_packages_are_converted_like_their_sources():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.binary")
+    tmp_packages = os.path.join(tmp_dir, "packages")
+    os.mkdir(tmp_packages)
+    testargs = ["prog", "--format", "binary", "--into", tmp_packages] + [
+        os.path.join(".", "tests", "data", f) for f in input_files
+    ]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+    assert len(os.listdir(tmp_packages)) == len(input_files)
+
+    # the directory of binary packages is walked, they are not converted into themselves
+    testargs = [
+        "prog",
+        "--format",
+        "binary,kicad5,kicad6",
+        "--into",
+        tmp_dir,
+        tmp_packages,
+    ]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+    for input_file in input_files:
+        basename = os.path.splitext(input_file)[0]
+        assert not os.path.exists(os.path.join(tmp_dir, f"{basename}.elsypkg"))
+        for extension in ["lib", "kicad_sym"]:
+            assert_that_source_is_converted_as_expected(
+                os.path.join(tmp_dir, f"{basename}.{extension}"),
+                os.path.join(".", "tests", "data.expected", f"{basename}.{extension}"),
+            )
+    with open(os.path.join(tmp_packages, "mc_68000_plcc68.elsypkg"), "rb") as f:
+        package = loadBinaryPackage(f)
+        f.seek(0)
+        assert binaryFrom(package) == f.read()
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_invalid_binary_packages_are_rejected():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.binary-invalid")
+    testargs = ["prog", "--format", "binary", "--into", tmp_dir]
+    with patch.object(
+        sys, "argv", testargs + [os.path.join(".", "tests", "data", "pal20r6.md")]
+    ):
+        SymbolGeneratorCli().run()
+    with open(os.path.join(tmp_dir, "pal20r6.elsypkg"), "rb") as f:
+        encoded = f.read()
+    with pytest.raises(ValueError, match="not a binary package"):
+        packageFromBinary(b"ELSYPK")
+    with pytest.raises(ValueError, match="not a binary package"):
+        packageFromBinary(b"X" + encoded[1:])
+    with pytest.raises(ValueError, match="unsupported version"):
+        packageFromBinary(encoded[:8] + b"\xff\xff" + encoded[10:])
+    with pytest.raises(ValueError, match="truncated"):
+        packageFromBinary(encoded[:-1])
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_decoded_packages_do_not_share_their_pins():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.binary-pins")
+    testargs = ["prog", "--format", "binary", "--into", tmp_dir]
+    with patch.object(
+        sys, "argv", testargs + [os.path.join(".", "tests", "data", "pal20r6.md")]
+    ):
+        SymbolGeneratorCli().run()
+    with open(os.path.join(tmp_dir, "pal20r6.elsypkg"), "rb") as f:
+        encoded = f.read()
+    first = packageFromBinary(encoded)
+    second = packageFromBinary(encoded)
+    pinsOfFirst = [p for g in first.groupedPins for p in g.pins]
+    pinsOfSecond = [p for g in second.groupedPins for p in g.pins]
+    assert len(pinsOfFirst) > 0
+    for a, b in zip(pinsOfFirst, pinsOfSecond):
+        assert a is not b
+        assert a.designator is not b.designator
+        assert a.dimensions is not b.dimensions
+    shutil.rmtree(tmp_dir)
@@ -26,6 +26,8 @@ import sys
 from typing import List, Union, Optional
 from unittest.mock import patch
 
+import pytest
+
 from .utils import (
     makeTmpDirOrDie,
     assert_that_source_is_converted_as_expected,
@@ -62,3 +64,48 @@ def test_that_format_kicad5_works_as_expected():
             tmp_dir, source_dir, expected_dir, baseArgs, input_file, output_file
         )
     shutil.rmtree(tmp_dir)
+
+
+def test_that_format_kicad5_works_as_expected_with_several_jobs():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.jobs")
+    source_dir = os.path.join(".", "tests", "data")
+    expected_dir = os.path.join(".", "tests", "data.expected")
+    testargs = ["prog", "--format", "kicad5", "--jobs", "2", "--into", tmp_dir] + [
+        os.path.join(source_dir, input_file) for input_file in input_files
+    ]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+    for output_file in output_files:
+        assert_that_source_is_converted_as_expected(
+            os.path.join(tmp_dir, output_file), os.path.join(expected_dir, output_file)
+        )
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_format_kicad5_generates_only_the_selected_variants():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.variants")
+    testargs = [
+        "prog",
+        "--format",
+        "kicad5",
+        "--variants",
+        "physical_single_unit,functionnal_single_unit",
+        "--into",
+        tmp_dir,
+        os.path.join(".", "tests", "data", "pal20r6.md"),
+    ]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+    with open(os.path.join(tmp_dir, "pal20r6.lib")) as f:
+        definitions = [line.split(" ")[1] for line in f if line.startswith("DEF ")]
+    # in the usual order, whatever the order of the option
+    assert [d.split("_")[-1] for d in definitions] == ["DIP", "PHY"]
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_unknown_variants_are_rejected():
+    testargs = ["prog", "--format", "kicad5", "--variants", "nope", "x.md"]
+    with patch.object(sys, "argv", testargs):
+        with pytest.raises(SystemExit) as exit:
+            SymbolGeneratorCli().run()
+    assert exit.value.code == 2
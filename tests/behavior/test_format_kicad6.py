@@ -20,30 +20,98 @@ If not, see <https://www.gnu.org/licenses/>.
 """
 
 import os
+import re
 import shutil
 import time
 import sys
-import pytest
 from unittest.mock import patch
 
-from .utils import makeTmpDirOrDie
+from .utils import (
+    makeTmpDirOrDie,
+    assert_that_source_is_converted_as_expected,
+    perform_test,
+)
 
 from electronic_symbol_generator_for_cad import SymbolGeneratorCli
 
-input_file = "mc_68000_plcc68.md"
+input_files = [
+    "dac0802.md",
+    "dram-256Kx1.md",
+    "mc_68000_plcc68.md",
+    "lf347.json",
+    "pal20r6.md",
+    "simm-30.md",
+]
+output_files = [
+    "dac0802.kicad_sym",
+    "dram-256Kx1.kicad_sym",
+    "mc_68000_plcc68.kicad_sym",
+    "lf347.kicad_sym",
+    "pal20r6.kicad_sym",
+    "simm-30.kicad_sym",
+]
 
 
 def test_that_format_kicad6_works_as_expected():
-    tmp_dir = makeTmpDirOrDie(time.time())
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.kicad6")
+    source_dir = os.path.join(".", "tests", "data")
+    expected_dir = os.path.join(".", "tests", "data.expected")
+    baseArgs = ["prog", "--format", "kicad6", "--into", tmp_dir]
+    for input_file, output_file in zip(input_files, output_files):
+        perform_test(
+            tmp_dir, source_dir, expected_dir, baseArgs, input_file, output_file
+        )
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_format_kicad6_works_as_expected_with_several_jobs():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.kicad6.jobs")
+    source_dir = os.path.join(".", "tests", "data")
+    expected_dir = os.path.join(".", "tests", "data.expected")
+    testargs = ["prog", "--format", "kicad6", "--jobs", "2", "--into", tmp_dir] + [
+        os.path.join(source_dir, input_file) for input_file in input_files
+    ]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+    for output_file in output_files:
+        assert_that_source_is_converted_as_expected(
+            os.path.join(tmp_dir, output_file), os.path.join(expected_dir, output_file)
+        )
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_format_kicad6_generates_balanced_expressions():
+    expected_dir = os.path.join(".", "tests", "data.expected")
+    for output_file in output_files:
+        with open(os.path.join(expected_dir, output_file)) as f:
+            # the strings may contain parenthesis
+            text = re.sub(r'"(?:[^"\\]|\\.)*"', '""', f.read())
+        depth = 0
+        for c in text:
+            depth += 1 if c == "(" else -1 if c == ")" else 0
+            assert depth >= 0, output_file
+        assert depth == 0, output_file
+
+
+def test_that_format_kicad6_generates_only_the_selected_variants():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.kicad6.variants")
     testargs = [
         "prog",
         "--format",
         "kicad6",
+        "--variants",
+        "physical_single_unit_socket",
         "--into",
         tmp_dir,
-        os.path.join(".", "tests", "data", input_file),
+        os.path.join(".", "tests", "data", "pal20r6.md"),
     ]
     with patch.object(sys, "argv", testargs):
-        with pytest.raises(RuntimeError):
-            SymbolGeneratorCli().run()
+        SymbolGeneratorCli().run()
+    with open(os.path.join(tmp_dir, "pal20r6.kicad_sym")) as f:
+        lines = f.readlines()
+    symbols = [line.split('"')[1] for line in lines if line.startswith("  (symbol ")]
+    assert [s.split("_")[-1] for s in symbols] == ["SOCKET", "SOCKET"]
+    pins = [line.split(" ")[7:9] for line in lines if line.startswith("      (pin ")]
+    assert len(pins) == 24
+    assert all(pin == ["passive", "line"] for pin in pins)
     shutil.rmtree(tmp_dir)
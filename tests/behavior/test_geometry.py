@@ -0,0 +1,90 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import os
+
+from electronic_package_descriptor import ParserOfMarkdownDatasheet
+
+from electronic_symbol_generator_for_cad.engine import (
+    CacheOfLayouts,
+    SideOfComponent,
+    geometryOfFunctionnalSymbol,
+    geometryOfMultiUnitSymbol,
+    geometryOfPhysicalSymbol,
+)
+from electronic_symbol_generator_for_cad.kicad5 import SymbolGeneratorForKicad5
+from electronic_symbol_generator_for_cad.kicad6 import SymbolGeneratorForKicad6
+
+
+def packageOf(name: str):
+    with open(os.path.join(".", "tests", "data", name)) as f:
+        return ParserOfMarkdownDatasheet().parseLines(f.readlines())
+
+
+def test_that_the_geometry_has_absolute_coordinates():
+    p = packageOf("pal20r6.md")
+    geometry = geometryOfFunctionnalSymbol(p, CacheOfLayouts(), 100)
+    assert [field.text for field in geometry.fields] == [
+        "U",
+        p.name,
+        "Package_DIP:DIP-24_W7.62mm_LongPads",
+        "https://www.ti.com/lit/ds/symlink/tibpal20r4-20m.pdf",
+    ]
+    assert geometry.countOfUnits == 1
+    (unit,) = geometry.units
+    assert unit.unit == 0
+    assert unit.rectangles[0] == (-400, 1200, 400, -1200, True)
+    assert len(unit.pins) == 24
+    clock = unit.pins[0]
+    assert (clock.pin.name, clock.x, clock.y, clock.side) == (
+        "CLK",
+        -700,
+        700,
+        SideOfComponent.WEST,
+    )
+
+
+def test_that_the_units_of_groups_having_the_same_structure_share_their_places():
+    p = packageOf("pal20r6.md")
+    layouts = CacheOfLayouts()
+    geometry = geometryOfMultiUnitSymbol(p, layouts, 100)
+    assert geometry.countOfUnits == 4
+    assert [unit.unit for unit in geometry.units] == [1, 2, 3, 4]
+    templates = [key for key in layouts.derived if key[0] == "template of unit"]
+    assert len(templates) <= len(geometry.units)
+    assert all(len(unit.texts) == 1 for unit in geometry.units)
+
+
+def test_that_the_geometry_is_computed_once_for_every_format():
+    p = packageOf("pal20r6.md")
+    expected = dict(SymbolGeneratorForKicad6(p).symbolSet)
+    layouts = CacheOfLayouts()
+    dict(SymbolGeneratorForKicad5(p, layouts=layouts).symbolSet)
+    computed = dict(layouts.derived)
+    assert dict(SymbolGeneratorForKicad6(p, layouts=layouts).symbolSet) == expected
+    # the geometries computed for kicad5 are reused as they are
+    assert all(layouts.derived[key] is computed[key] for key in computed)
+    builders = [
+        geometryOfFunctionnalSymbol,
+        geometryOfMultiUnitSymbol,
+        geometryOfPhysicalSymbol,
+    ]
+    assert [key[0] for key in layouts.derived if key[0] in builders] == builders
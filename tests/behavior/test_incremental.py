@@ -0,0 +1,129 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import os
+import shutil
+import time
+import sys
+from unittest.mock import patch
+
+from electronic_package_descriptor import ParserOfMarkdownDatasheet
+
+from .utils import makeTmpDirOrDie
+
+from electronic_symbol_generator_for_cad import SymbolGeneratorCli
+from electronic_symbol_generator_for_cad.incremental import versionOfDistribution
+
+input_file = "pal20r6.md"
+output_file = "pal20r6.lib"
+
+
+def test_that_incremental_mode_skips_up_to_date_targets(capsys):
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.incremental")
+    tmp_src = os.path.join(tmp_dir, input_file)
+    shutil.copy(os.path.join(".", "tests", "data", input_file), tmp_src)
+    testargs = ["prog", "--format", "kicad5", "--incremental", tmp_src]
+    with patch.object(sys, "argv", testargs):
+        # first run generates the target and the manifest
+        SymbolGeneratorCli().run()
+        assert os.path.exists(os.path.join(tmp_dir, output_file))
+        assert os.path.exists(os.path.join(tmp_dir, ".elsygen-manifest.json"))
+        assert "up to date" not in capsys.readouterr().out
+
+        # second run does nothing
+        SymbolGeneratorCli().run()
+        assert "up to date" in capsys.readouterr().out
+
+        # touching the source without changing its content does nothing
+        os.utime(tmp_src, ns=(time.time_ns(), time.time_ns()))
+        SymbolGeneratorCli().run()
+        assert "up to date" in capsys.readouterr().out
+
+        # changing the source regenerates the target
+        with open(tmp_src, "a") as f:
+            f.write("\n")
+        SymbolGeneratorCli().run()
+        assert "up to date" not in capsys.readouterr().out
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_the_manifest_records_the_content_actually_converted(capsys):
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.incremental-changed")
+    tmp_src = os.path.join(tmp_dir, input_file)
+    shutil.copy(os.path.join(".", "tests", "data", input_file), tmp_src)
+    testargs = ["prog", "--format", "kicad5", "--incremental", tmp_src]
+    parseLines = ParserOfMarkdownDatasheet.parseLines
+
+    def parseThenChangeTheSource(parser, lines):
+        # the source changes while it is converted
+        with open(tmp_src, "a") as f:
+            f.write("\n")
+        return parseLines(parser, lines)
+
+    with patch.object(sys, "argv", testargs):
+        with patch.object(
+            ParserOfMarkdownDatasheet,
+            "parseLines",
+            autospec=True,
+            side_effect=parseThenChangeTheSource,
+        ):
+            SymbolGeneratorCli().run()
+        capsys.readouterr()
+
+        # the target has been generated from the previous content
+        SymbolGeneratorCli().run()
+        assert "up to date" not in capsys.readouterr().out
+        SymbolGeneratorCli().run()
+        assert "up to date" in capsys.readouterr().out
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_colliding_targets_are_reported(capsys):
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.incremental-collision")
+    sources = []
+    for name in ["a", "b"]:
+        os.mkdir(os.path.join(tmp_dir, name))
+        sources.append(os.path.join(tmp_dir, name, input_file))
+        shutil.copy(os.path.join(".", "tests", "data", input_file), sources[-1])
+    testargs = ["prog", "--format", "kicad5", "--incremental", "--into", tmp_dir]
+    with patch.object(sys, "argv", testargs + sources):
+        SymbolGeneratorCli().run()
+    assert "is generated from both" in capsys.readouterr().out
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_the_code_of_a_generator_not_installed_is_versioned(monkeypatch):
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.incremental-version")
+    nameOfModule = f"elsygen_probe_{time.time_ns()}"
+    os.mkdir(os.path.join(tmp_dir, nameOfModule))
+    pathOfCode = os.path.join(tmp_dir, nameOfModule, "__init__.py")
+    with open(pathOfCode, "w") as f:
+        f.write("answer = 42\n")
+    monkeypatch.syspath_prepend(os.path.abspath(tmp_dir))
+
+    # a distribution that is not installed is versioned by the content of its code
+    version = versionOfDistribution("no-such-distribution", nameOfModule)
+    assert version.startswith("sources-")
+    assert versionOfDistribution("no-such-distribution", nameOfModule) == version
+    with open(pathOfCode, "a") as f:
+        f.write("question = None\n")
+    assert versionOfDistribution("no-such-distribution", nameOfModule) != version
+    shutil.rmtree(tmp_dir)
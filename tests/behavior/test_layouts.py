@@ -0,0 +1,90 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import os
+
+from electronic_package_descriptor import (
+    GroupOfPins,
+    LayoutOfPins,
+    PackageDescription,
+    ParserOfMarkdownDatasheet,
+    PatternOfGroup,
+    PinDescription,
+)
+
+from electronic_symbol_generator_for_cad.engine import (
+    LayoutManagerForPhysicalSingleUnit,
+    LayoutManagerForSingleGroup,
+    LayoutManagerForSingleUnit,
+    geometryOfPhysicalSymbol,
+)
+from electronic_symbol_generator_for_cad.kicad5 import SymbolGeneratorForKicad5
+from electronic_symbol_generator_for_cad.kicad5.symbolGenerator_geometry import (
+    SymbolGeneratorForKicad5_FromGeometry,
+)
+
+
+def test_that_each_layout_is_computed_once_for_all_the_variants():
+    with open(os.path.join(".", "tests", "data", "pal20r6.md")) as f:
+        p = ParserOfMarkdownDatasheet().parseLines(f.readlines())
+    generator = SymbolGeneratorForKicad5(p)
+    symbols = dict(generator.symbolSet)
+    strategies = [strategy for strategy, subject in generator.layouts.layouts]
+    # the physical layout is shared by the physical variants
+    assert strategies.count(LayoutManagerForPhysicalSingleUnit) == 1
+    assert strategies.count(LayoutManagerForSingleUnit) == 1
+    # the geometry and the pins of the physical variants are computed once
+    keys = [key[0] for key in generator.layouts.derived]
+    assert keys.count(geometryOfPhysicalSymbol) == 1
+    assert keys.count(SymbolGeneratorForKicad5_FromGeometry.toRecordsOfPins) == 1
+    assert SymbolGeneratorForKicad5(p).symbolSet == symbols
+
+
+def groupOfPower(typeOfPins: str, names) -> GroupOfPins:
+    g = GroupOfPins(
+        "power",
+        1,
+        "Power",
+        [
+            PinDescription(str(i), name, typeOfPins, "")
+            for i, name in enumerate(names, 1)
+        ],
+    )
+    assert g.pattern == PatternOfGroup.POWER
+    return g
+
+
+def test_that_a_group_of_power_inputs_only_is_laid_out():
+    g = groupOfPower("PWR", ["VCC", "VDD"])
+    layout = LayoutManagerForSingleGroup(g).apply()
+    assert [pin.name for pin in layout.west.items] == ["VCC", "VDD"]
+    assert layout.south.length == 0
+    p = PackageDescription("X", [g], [], layoutOfPins=LayoutOfPins.DUAL_INLINE_PACKAGE)
+    assert len(dict(SymbolGeneratorForKicad5(p).symbolSet)) == 4
+
+
+def test_that_a_group_of_grounds_only_is_laid_out():
+    g = groupOfPower("GND", ["GND", "VSS"])
+    layout = LayoutManagerForSingleGroup(g).apply()
+    assert [pin.name for pin in layout.south.items] == ["GND", "VSS"]
+    assert layout.west.length == 0
+    p = PackageDescription("X", [g], [], layoutOfPins=LayoutOfPins.DUAL_INLINE_PACKAGE)
+    assert len(dict(SymbolGeneratorForKicad5(p).symbolSet)) == 4
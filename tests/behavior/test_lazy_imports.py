@@ -0,0 +1,60 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import os
+import subprocess
+import sys
+from typing import List
+
+
+def importedModules(arguments: List[str]) -> List[str]:
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-m",
+            "electronic_symbol_generator_for_cad",
+        ]
+        + arguments,
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode == 0
+    return [
+        line.split("|")[-1].strip()
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:")
+    ]
+
+
+def test_that_help_does_not_load_any_output_format():
+    modules = importedModules(["--help"])
+    assert "electronic_package_descriptor" not in modules
+    assert "electronic_symbol_generator_for_cad.kicad5" not in modules
+
+
+def test_that_json_format_does_not_load_kicad5():
+    modules = importedModules(
+        ["--format", "json", os.path.join(".", "tests", "data", "lf347.json")]
+    )
+    assert "electronic_package_descriptor" not in modules  # json sources are skipped
+    assert "electronic_symbol_generator_for_cad.kicad5" not in modules
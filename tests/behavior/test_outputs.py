@@ -0,0 +1,97 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import os
+import shutil
+import time
+import sys
+import pytest
+from unittest.mock import patch
+
+from .utils import makeTmpDirOrDie
+
+from electronic_symbol_generator_for_cad import SymbolGeneratorCli
+from electronic_symbol_generator_for_cad import outputs
+from electronic_symbol_generator_for_cad.outputs import writeIfChanged
+from electronic_symbol_generator_for_cad.timings import RecorderOfTimings
+
+input_file = "pal20r6.md"
+output_file = "pal20r6.lib"
+
+
+def test_that_unchanged_targets_are_left_untouched(capsys):
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.outputs")
+    target = os.path.join(tmp_dir, output_file)
+    testargs = [
+        "prog",
+        "--format",
+        "kicad5",
+        "--into",
+        tmp_dir,
+        os.path.join(".", "tests", "data", input_file),
+    ]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+        assert "1 file(s) written, 0 file(s) left untouched." in capsys.readouterr().out
+        os.utime(target, ns=(0, 0))
+
+        SymbolGeneratorCli().run()
+        assert "0 file(s) written, 1 file(s) left untouched." in capsys.readouterr().out
+        assert os.stat(target).st_mtime_ns == 0
+    assert os.listdir(tmp_dir) == [output_file]
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_an_interrupted_generation_keeps_the_previous_target():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.interrupted")
+    target = os.path.join(tmp_dir, "target.txt")
+    assert writeIfChanged(target, lambda out: out.write("previous\n"))
+
+    def failingEmitter(out):
+        out.write("partial")
+        raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        writeIfChanged(target, failingEmitter)
+    assert os.listdir(tmp_dir) == ["target.txt"]
+    with open(target) as f:
+        assert f.read() == "previous\n"
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_the_content_is_written_by_chunks_during_the_write_stage():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.chunks")
+    target = os.path.join(tmp_dir, "target.txt")
+    recorder = RecorderOfTimings()
+    buffered = []
+
+    def emitter(out):
+        for i in range(100):
+            out.write(f"line {i}\n")
+            buffered.append(out.size)
+
+    with patch.object(outputs, "sizeOfChunks", 64), recorder.activated():
+        assert writeIfChanged(target, emitter)
+    assert max(buffered) < 64
+    assert set(recorder.stages) == {"render", "write"}
+    with open(target) as f:
+        assert f.read() == "".join(f"line {i}\n" for i in range(100))
+    shutil.rmtree(tmp_dir)
@@ -0,0 +1,98 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import random
+
+from electronic_package_descriptor import PinDescription
+
+from electronic_symbol_generator_for_cad.engine import RailOfPins
+
+
+class ListOfItems:
+    """The former list based rail, as a reference."""
+
+    def __init__(self):
+        self.items = []
+
+    def push(self, pins, withSeparator=False):
+        if len(pins) > 0:
+            if withSeparator and len(self.items) > 0:
+                self.items.append(None)
+            self.items.extend(pins)
+
+    def fillToLength(self, n):
+        self.items += [None] * max(0, n - len(self.items))
+
+    def fillToLengthBefore(self, n):
+        self.items = [None] * max(0, n - len(self.items)) + self.items
+
+    def fillToLengthCentered(self, n):
+        delta = n - len(self.items)
+        if delta > 0:
+            before = 0 if delta < 2 else int(delta / 2)
+            self.items = [None] * before + self.items + [None] * (delta - before)
+
+    def trim(self):
+        while len(self.items) > 0 and self.items[0] == None:
+            self.items.pop(0)
+        while len(self.items) > 0 and self.items[-1] == None:
+            self.items.pop()
+
+
+namesOfFillings = {
+    "fill": "fillToLength",
+    "before": "fillToLengthBefore",
+    "centered": "fillToLengthCentered",
+}
+
+
+def test_that_rail_of_pins_behaves_like_a_list_of_items():
+    rng = random.Random(42)
+    for _ in range(200):
+        rail = RailOfPins()
+        reference = ListOfItems()
+        for _ in range(rng.randint(0, 12)):
+            operation = rng.choice(
+                ["push", "push", "fill", "before", "centered", "trim"]
+            )
+            if operation == "push":
+                pins = [
+                    (
+                        None
+                        if rng.random() < 0.3
+                        else PinDescription(
+                            str(rng.randint(1, 99)), f"P~{rng.randint(1, 999)}", "I", ""
+                        )
+                    )
+                    for _ in range(rng.randint(0, 4))
+                ]
+                separator = rng.random() < 0.5
+                rail.push(pins, withSeparator=separator)
+                reference.push(pins, withSeparator=separator)
+            elif operation == "trim":
+                rail.trim()
+                reference.trim()
+            else:
+                n = rng.randint(0, 20)
+                getattr(rail, namesOfFillings[operation])(n)
+                getattr(reference, namesOfFillings[operation])(n)
+            assert rail.length == len(reference.items)
+            assert rail.items == reference.items
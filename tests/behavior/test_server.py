@@ -0,0 +1,159 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import io
+import json
+import os
+import shutil
+import threading
+import time
+import socketserver
+
+from .utils import makeTmpDirOrDie, assert_that_source_is_converted_as_expected
+
+from electronic_symbol_generator_for_cad.client import (
+    forwardToServer,
+    forwardedEnvironment,
+)
+from electronic_symbol_generator_for_cad.server import (
+    HandlerOfConnection,
+    handleRequest,
+    serveLines,
+)
+
+input_file = "pal20r6.md"
+output_file = "pal20r6.lib"
+
+
+def requestFor(tmp_dir: str) -> dict:
+    return {
+        "argv": [
+            "--format",
+            "kicad5",
+            "--into",
+            os.path.abspath(tmp_dir),
+            os.path.join("tests", "data", input_file),
+        ],
+        "cwd": os.getcwd(),
+    }
+
+
+def assert_that_target_is_generated(tmp_dir: str):
+    assert_that_source_is_converted_as_expected(
+        os.path.join(tmp_dir, output_file),
+        os.path.join(".", "tests", "data.expected", output_file),
+    )
+
+
+def test_that_json_lines_requests_are_served():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.stdio")
+    sink = io.StringIO()
+    serveLines(
+        io.StringIO(json.dumps(requestFor(tmp_dir)) + "\n" + '{"argv": ["-f"]}\n'),
+        sink,
+    )
+    responses = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert responses[0]["status"] == 0
+    assert "Done" in responses[0]["output"]
+    assert responses[1]["status"] == 2  # invalid arguments
+    assert_that_target_is_generated(tmp_dir)
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_the_client_forwards_to_the_server(capsys):
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.socket")
+    os.chmod(tmp_dir, 0o700)
+    pathOfSocket = os.path.join(tmp_dir, "elsygen.sock")
+    assert forwardToServer([], pathOfSocket) == None  # no server yet
+    with socketserver.UnixStreamServer(pathOfSocket, HandlerOfConnection) as server:
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            status = forwardToServer(requestFor(tmp_dir)["argv"], pathOfSocket)
+        finally:
+            server.shutdown()
+            thread.join()
+    assert status == 0
+    assert "Done" in capsys.readouterr().out
+    assert_that_target_is_generated(tmp_dir)
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_the_environment_of_the_client_is_used():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.env")
+    cache_dir = os.path.abspath(os.path.join(tmp_dir, "cache"))
+    request = requestFor(tmp_dir)
+    request["env"] = {"ELSYGEN_CACHE": cache_dir}
+    assert "ELSYGEN_CACHE" not in os.environ
+    assert handleRequest(request)["status"] == 0
+    assert len(os.listdir(cache_dir)) == 1
+    assert "ELSYGEN_CACHE" not in os.environ
+    assert_that_target_is_generated(tmp_dir)
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_only_the_variables_of_the_generator_are_forwarded(monkeypatch):
+    monkeypatch.setenv("ELSYGEN_CACHE", "/path/to/cache")
+    monkeypatch.setenv("SOME_TOKEN", "secret")
+    env = forwardedEnvironment()
+    assert env["ELSYGEN_CACHE"] == "/path/to/cache"
+    assert "SOME_TOKEN" not in env
+    assert all(name.startswith("ELSYGEN_") for name in env)
+
+
+def test_that_the_client_refuses_a_socket_accessible_to_other_users():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.shared")
+    os.chmod(tmp_dir, 0o755)
+    pathOfSocket = os.path.join(tmp_dir, "elsygen.sock")
+    with socketserver.UnixStreamServer(pathOfSocket, HandlerOfConnection) as server:
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            status = forwardToServer(requestFor(tmp_dir)["argv"], pathOfSocket)
+        finally:
+            server.shutdown()
+            thread.join()
+    assert status == None
+    assert not os.path.exists(os.path.join(tmp_dir, output_file))
+    shutil.rmtree(tmp_dir)
+
+
+class HandlerClosingTheConnection(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.rfile.readline()
+
+
+def test_that_the_client_gives_up_when_the_server_does_not_answer():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.no-answer")
+    os.chmod(tmp_dir, 0o700)
+    pathOfSocket = os.path.join(tmp_dir, "elsygen.sock")
+    with socketserver.UnixStreamServer(
+        pathOfSocket, HandlerClosingTheConnection
+    ) as server:
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            status = forwardToServer(requestFor(tmp_dir)["argv"], pathOfSocket)
+        finally:
+            server.shutdown()
+            thread.join()
+    assert status == None
+    shutil.rmtree(tmp_dir)
@@ -0,0 +1,96 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import os
+import shutil
+import time
+import sys
+from unittest.mock import patch
+
+from electronic_package_descriptor import ParserOfMarkdownDatasheet
+
+from .utils import makeTmpDirOrDie, assert_that_source_is_converted_as_expected
+
+from electronic_symbol_generator_for_cad import SymbolGeneratorCli
+
+input_file = "pal20r6.md"
+
+
+def test_that_each_source_is_parsed_once_for_several_formats():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.formats")
+    testargs = [
+        "prog",
+        "--format",
+        "kicad5,kicad6",
+        "-f",
+        "json",
+        "--format",
+        "kicad5",
+        "--into",
+        tmp_dir,
+        os.path.join(".", "tests", "data", input_file),
+        os.path.join(".", "tests", "data", "lf347.json"),
+    ]
+    parseLines = ParserOfMarkdownDatasheet.parseLines
+    with (
+        patch.object(sys, "argv", testargs),
+        patch.object(
+            ParserOfMarkdownDatasheet,
+            "parseLines",
+            autospec=True,
+            side_effect=parseLines,
+        ) as parser,
+    ):
+        SymbolGeneratorCli().run()
+        assert parser.call_count == 1
+    for output_file in [
+        "pal20r6.lib",
+        "pal20r6.kicad_sym",
+        "lf347.lib",
+        "lf347.kicad_sym",
+    ]:
+        assert_that_source_is_converted_as_expected(
+            os.path.join(tmp_dir, output_file),
+            os.path.join(".", "tests", "data.expected", output_file),
+        )
+    assert os.path.exists(os.path.join(tmp_dir, "pal20r6.json"))
+    assert not os.path.exists(os.path.join(tmp_dir, "lf347.json"))
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_incremental_mode_tracks_each_format(capsys):
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.formats-incremental")
+    tmp_src = os.path.join(tmp_dir, input_file)
+    shutil.copy(os.path.join(".", "tests", "data", input_file), tmp_src)
+    testargs = ["prog", "--format", "kicad5,kicad6", "--incremental", tmp_src]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+        assert "2 file(s) written, 0 file(s) left untouched." in capsys.readouterr().out
+
+        SymbolGeneratorCli().run()
+        assert "0 file(s) written, 2 file(s) left untouched." in capsys.readouterr().out
+
+        # a missing target regenerates the targets of the source
+        os.remove(os.path.join(tmp_dir, "pal20r6.kicad_sym"))
+        SymbolGeneratorCli().run()
+        assert "up to date" not in capsys.readouterr().out
+        assert os.path.exists(os.path.join(tmp_dir, "pal20r6.kicad_sym"))
+    shutil.rmtree(tmp_dir)
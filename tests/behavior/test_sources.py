@@ -0,0 +1,107 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import os
+import pytest
+import shutil
+import time
+import sys
+from unittest.mock import patch
+
+from .utils import makeTmpDirOrDie, assert_that_source_is_converted_as_expected
+
+from electronic_symbol_generator_for_cad import SymbolGeneratorCli
+
+source_dir = os.path.join(".", "tests", "data")
+expected_dir = os.path.join(".", "tests", "data.expected")
+
+
+def test_that_directories_are_walked_recursively():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.sources")
+    tmp_src = os.path.join(tmp_dir, "src")
+    tmp_out = os.path.join(tmp_dir, "out")
+    os.makedirs(os.path.join(tmp_src, "nested"))
+    os.mkdir(tmp_out)
+    shutil.copy(os.path.join(source_dir, "pal20r6.md"), tmp_src)
+    shutil.copy(os.path.join(source_dir, "lf347.json"), os.path.join(tmp_src, "nested"))
+    with open(os.path.join(tmp_src, "notes.txt"), "w") as f:
+        f.write("not a source")
+    with open(os.path.join(tmp_src, ".elsygen-manifest.json"), "w") as f:
+        f.write("{}")
+    testargs = ["prog", "--format", "kicad5", "--into", tmp_out, tmp_src]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+    assert sorted(os.listdir(tmp_out)) == ["lf347.lib", "pal20r6.lib"]
+    for output_file in ["lf347.lib", "pal20r6.lib"]:
+        assert_that_source_is_converted_as_expected(
+            os.path.join(tmp_out, output_file), os.path.join(expected_dir, output_file)
+        )
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_glob_patterns_are_expanded():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.glob")
+    testargs = [
+        "prog",
+        "--format",
+        "kicad5",
+        "--into",
+        tmp_dir,
+        os.path.join(source_dir, "d*.md"),
+    ]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+    assert sorted(os.listdir(tmp_dir)) == ["dac0802.lib", "dram-256Kx1.lib"]
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_a_source_matching_nothing_is_an_error():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.missing")
+    testargs = [
+        "prog",
+        "--format",
+        "kicad5",
+        "--into",
+        tmp_dir,
+        os.path.join(source_dir, "pal20r6.md"),
+        os.path.join(source_dir, "no-such-file.md"),
+    ]
+    with patch.object(sys, "argv", testargs):
+        with pytest.raises(SystemExit) as exit:
+            SymbolGeneratorCli().run()
+    assert exit.value.code == 2
+    assert os.listdir(tmp_dir) == []  # nothing is converted
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_a_loop_of_symbolic_links_is_walked_once():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.loop")
+    tmp_src = os.path.join(tmp_dir, "src")
+    tmp_out = os.path.join(tmp_dir, "out")
+    os.makedirs(os.path.join(tmp_src, "nested"))
+    os.mkdir(tmp_out)
+    shutil.copy(os.path.join(source_dir, "pal20r6.md"), tmp_src)
+    os.symlink(os.path.abspath(tmp_src), os.path.join(tmp_src, "nested", "loop"))
+    testargs = ["prog", "--format", "kicad5", "--into", tmp_out, tmp_src]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+    assert os.listdir(tmp_out) == ["pal20r6.lib"]
+    shutil.rmtree(tmp_dir)
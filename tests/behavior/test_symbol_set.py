@@ -0,0 +1,47 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import os
+
+from electronic_package_descriptor import ParserOfMarkdownDatasheet
+
+from electronic_symbol_generator_for_cad.kicad5 import SymbolGeneratorForKicad5
+
+
+def test_that_each_symbol_is_rendered_on_access_and_once():
+    with open(os.path.join(".", "tests", "data", "pal20r6.md")) as f:
+        p = ParserOfMarkdownDatasheet().parseLines(f.readlines())
+    generator = SymbolGeneratorForKicad5(p)
+    symbols = generator.symbolSet
+    assert generator.layouts.layouts == {}
+    physical = symbols["physical_single_unit"]
+    assert symbols["physical_single_unit"] is physical
+    assert all(
+        generator.generators[key].rendered == None
+        for key in generator.generators
+        if key != "physical_single_unit"
+    )
+    # after a change of the package, the symbols are rendered again
+    p.name = "PAL20R8"
+    generator.invalidate()
+    assert generator.layouts.layouts == {}
+    assert symbols["physical_single_unit"] is not physical
+    assert "PAL20R8" in symbols["physical_single_unit"][1]
@@ -0,0 +1,91 @@
+"""
+---
+(c) 2022 David SPORN
+---
+This is part of Electronic Symbol Generator for CAD.
+
+Electronic Symbol Generator for CAD is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your option)
+any later version.
+
+Electronic Symbol Generator for CAD is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+or FITNESS FOR A PARTICULAR PURPOSE.
+
+See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with Electronic Symbol Generator for CAD.
+If not, see <https://www.gnu.org/licenses/>.
+---
+"""
+
+import json
+import os
+import pstats
+import shutil
+import time
+import sys
+from unittest.mock import patch
+
+from .utils import makeTmpDirOrDie
+
+from electronic_symbol_generator_for_cad import SymbolGeneratorCli
+
+input_file = "pal20r6.md"
+
+
+def test_that_timings_are_written_for_each_source():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.timings")
+    tmp_timings = os.path.join(tmp_dir, "timings.jsonl")
+    testargs = [
+        "prog",
+        "--format",
+        "kicad5",
+        "--into",
+        tmp_dir,
+        "--timings",
+        tmp_timings,
+        os.path.join(".", "tests", "data", input_file),
+        os.path.join(".", "tests", "data", "lf347.json"),
+    ]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+    with open(tmp_timings) as f:
+        records = [json.loads(line) for line in f]
+    assert [os.path.basename(r["source"]) for r in records] == [
+        input_file,
+        "lf347.json",
+    ]
+    for record in records:
+        assert set(record["stages"]) == {"parse", "layout", "render", "write"}
+        assert set(record["variants"]) == {
+            "functionnal_single_unit",
+            "functionnal_multi_unit",
+            "physical_single_unit",
+            "physical_single_unit_socket",
+        }
+        assert abs(record["total"] - sum(record["stages"].values())) < 1e-9
+    shutil.rmtree(tmp_dir)
+
+
+def test_that_a_profile_is_written_for_each_source():
+    tmp_dir = makeTmpDirOrDie(f"{time.time()}.profile")
+    tmp_profiles = os.path.join(tmp_dir, "profiles")
+    testargs = [
+        "prog",
+        "--format",
+        "kicad5",
+        "--into",
+        tmp_dir,
+        "--profile",
+        tmp_profiles,
+        os.path.join(".", "tests", "data", input_file),
+    ]
+    with patch.object(sys, "argv", testargs):
+        SymbolGeneratorCli().run()
+    profiles = os.listdir(tmp_profiles)
+    assert len(profiles) == 1
+    assert profiles[0].endswith("pal20r6.md.prof")
+    stats = pstats.Stats(os.path.join(tmp_profiles, profiles[0]))
+    assert stats.total_calls > 0
+    shutil.rmtree(tmp_dir)